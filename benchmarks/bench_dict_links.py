@@ -0,0 +1,97 @@
+"""Compares legacy ($unwind + $group) and current ($map + $arrayToObject) pipelines of dict links.
+
+Usage: python -m benchmarks.bench_dict_links
+
+Requires running MongoDB, see BUTTY_TESTS_MONGO_HOST in tests/conftest.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from os import environ
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from butty import Engine, LinkField
+from butty.engine import DocModelInfo
+from butty.query import MongoQuery
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+BUTTY_TESTS_MONGO_HOST = environ.get("BUTTY_TESTS_MONGO_HOST", "localhost")
+BUTTY_BENCH_MONGO_DB_NAME = environ.get("BUTTY_BENCH_MONGO_DB_NAME", "butty_bench")
+
+MAP_SIZE = 1000
+DOCS_COUNT = 100
+ROUNDS = 5
+
+
+class Foo(SerialIDDocument):
+    name: str
+
+
+class Bar(SerialIDDocument):
+    name: str
+    foos: dict[str, Foo] = LinkField()
+
+
+def legacy_pipeline(info: DocModelInfo, foo_info: DocModelInfo) -> list[MongoQuery]:
+    assert foo_info.default_expansion is not None
+    link = info.links["foos"]
+    other_aliases = {f.alias for f in info.fields.values() if f.name != "foos" if f.alias != "_id"}
+    return [
+        {"$set": {link.link_name: {"$objectToArray": "$" + link.link_name}}},
+        {"$unwind": {"path": "$" + link.link_name, "preserveNullAndEmptyArrays": True}},
+        {"$lookup": {
+            "from": Foo.__collection__.name,
+            "localField": link.link_name + ".v",
+            "foreignField": foo_info.identity.alias,
+            "as": link.link_name + ".v",
+            "pipeline": foo_info.default_expansion.pipeline,
+        }},
+        {"$set": {link.link_name + ".v": {"$first": "$" + link.link_name + ".v"}}},
+        {"$group": {"_id": "$_id", "foos": {"$push": "$" + link.link_name}} | {
+            a: {"$first": "$" + a} for a in other_aliases
+        }},
+        {"$set": {"foos": {"$arrayToObject": {"$filter": {"input": "$foos", "cond": {"$ne": ["$this", {}]}}}}}},
+        {"$project": {f.alias: 1 for f in info.fields.values()}},
+    ]
+
+
+async def measure(pipeline: list[MongoQuery]) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        res: list[Any] = await Bar.__collection__.aggregate(pipeline).to_list(None)
+        best = min(best, time.perf_counter() - started)
+        assert len(res) == DOCS_COUNT
+    return best
+
+
+async def main() -> None:
+    motor: Any = AsyncIOMotorClient(BUTTY_TESTS_MONGO_HOST)
+    await motor.drop_database(BUTTY_BENCH_MONGO_DB_NAME)
+    engine = await Engine(motor[BUTTY_BENCH_MONGO_DB_NAME]).bind(SerialIDCounter, Foo, Bar).init()
+
+    foos = [await Foo(name=f"foo{i}").save() for i in range(MAP_SIZE)]
+    for i in range(DOCS_COUNT):
+        await Bar(name=f"bar{i}", foos={str(j): foo for j, foo in enumerate(foos)}).save()
+
+    info = engine.doc_models_info[Bar]
+    assert info.default_expansion is not None
+
+    legacy = await measure(legacy_pipeline(info, engine.doc_models_info[Foo]))
+    current = await measure(info.default_expansion.pipeline)
+
+    print(f"dict link with {MAP_SIZE} entries, {DOCS_COUNT} documents, best of {ROUNDS}:")
+    print(f"  legacy  ($unwind + $group):       {legacy * 1000:.1f} ms")
+    print(f"  current ($map + $arrayToObject):  {current * 1000:.1f} ms")
+    print(f"  speedup: {legacy / current:.2f}x")
+
+    engine.unbind()
+    await motor.drop_database(BUTTY_BENCH_MONGO_DB_NAME)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""Compares validated and trusted (validate=False) reads of documents with nested models and links.
+
+Construction of documents from already read data is measured separately from whole reads, and reads within
+Engine.session() additionally pay for snapshots of loaded documents used for change tracking.
+
+Usage: python -m benchmarks.bench_trusted_read
+
+Requires running MongoDB, see BUTTY_TESTS_MONGO_HOST in tests/conftest.py.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import datetime
+from os import environ
+from typing import Any, Awaitable, Callable
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import BaseModel
+
+from butty import Engine, Q
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+BUTTY_TESTS_MONGO_HOST = environ.get("BUTTY_TESTS_MONGO_HOST", "localhost")
+BUTTY_BENCH_MONGO_DB_NAME = environ.get("BUTTY_BENCH_MONGO_DB_NAME", "butty_bench")
+
+DOCS_COUNT = 10000
+ITEMS_COUNT = 10
+ROUNDS = 5
+
+
+class Customer(SerialIDDocument):
+    name: str
+    email: str
+
+
+class Item(BaseModel):
+    sku: str
+    quantity: int
+    price: float
+
+
+class Order(SerialIDDocument):
+    number: int
+    created: datetime
+    customer: Customer
+    items: list[Item]
+    notes: dict[str, str]
+
+
+async def measure(read: Callable[[], Awaitable[list[Any]]]) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        res = await read()
+        best = min(best, time.perf_counter() - started)
+        assert len(res) == DOCS_COUNT
+    return best
+
+
+async def measure_in_session(engine: Engine, validate: bool) -> float:
+    best = float("inf")
+    for _ in range(ROUNDS):
+        async with engine.session():
+            started = time.perf_counter()
+            res = await Order.find(validate=validate)
+            best = min(best, time.perf_counter() - started)
+        assert len(res) == DOCS_COUNT
+    return best
+
+
+async def main() -> None:
+    motor: Any = AsyncIOMotorClient(BUTTY_TESTS_MONGO_HOST)
+    await motor.drop_database(BUTTY_BENCH_MONGO_DB_NAME)
+    engine = await Engine(motor[BUTTY_BENCH_MONGO_DB_NAME]).bind(SerialIDCounter, Customer, Order).init()
+
+    customer = await Customer(name="Vasya", email="vasya@example.com").save()
+    await Order.save_many([
+        Order(
+            number=i,
+            created=datetime(2020, 1, 1),
+            customer=customer,
+            items=[Item(sku=f"sku{j}", quantity=j, price=j * 1.5) for j in range(ITEMS_COUNT)],
+            notes={"delivery": "door", "payment": "card"},
+        )
+        for i in range(DOCS_COUNT)
+    ])
+
+    # stored data as read by find(), with joined customer
+    info = engine.doc_models_info[Order]
+    expansion = engine._get_find_expansion(Order, None, None, None)
+    pipeline = engine._get_find_pipeline(info, Q(None), expansion=expansion)
+    mongo_docs = await Order.__collection__.aggregate(pipeline).to_list(None)
+    mongo_docs = await engine._complete_docs(Order, expansion, mongo_docs)
+
+    results = [
+        ("construction", [
+            await measure(lambda: engine._validate_docs(Order, mongo_docs, validate=validate))
+            for validate in (True, False)
+        ]),
+        ("find()", [
+            await measure(lambda: Order.find(validate=validate))
+            for validate in (True, False)
+        ]),
+        ("find() in session", [
+            await measure_in_session(engine, validate=validate)
+            for validate in (True, False)
+        ]),
+    ]
+
+    print(f"{DOCS_COUNT} documents with {ITEMS_COUNT} nested items and a link, best of {ROUNDS}:")
+    print(f"  {'':20} {'validated':>10} {'trusted':>10} {'speedup':>8}")
+    for name, (validated, trusted) in results:
+        print(f"  {name:20} {validated * 1000:7.1f} ms {trusted * 1000:7.1f} ms {validated / trusted:7.2f}x")
+
+    engine.unbind()
+    await motor.drop_database(BUTTY_BENCH_MONGO_DB_NAME)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,7 +2,7 @@ from butty import errors
 from butty.document import Document, DocumentConfigBase
 from butty.engine import Engine
 from butty.fields import BackLinkField, IdentityField, IndexedField, LinkField
-from butty.query import ALL, F, Inc, Q, Set
+from butty.query import ALL, AddToSet, CurrentDate, F, Inc, Max, Min, Mul, Pull, Push, Q, Set, Unset
 
 __all__ = [
     "errors",
@@ -18,4 +18,12 @@ __all__ = [
     "F",
     "Q",
     "Set",
+    "Mul",
+    "Min",
+    "Max",
+    "Push",
+    "AddToSet",
+    "Pull",
+    "Unset",
+    "CurrentDate",
 ]
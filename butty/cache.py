@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Hashable, TypeAlias
+
+from motor.core import AgnosticCollection
+
+ChangeEventSource: TypeAlias = Callable[[AgnosticCollection[Any], Any], AsyncIterator[dict[str, Any]]]
+"""Opens stream of change events of collection, resuming after given token (None to start from now)."""
+
+
+@dataclass(kw_only=True)
+class CacheStats:
+    """Usage of document cache."""
+
+    size: int
+    """Number of cached documents."""
+    hits: int
+    """Number of documents served from cache."""
+    misses: int
+    """Number of documents requested from cache and not found there."""
+
+
+class DocumentCache:
+    """In-process LRU cache of joined documents by identity with optional TTL.
+
+    Document can be cached in several forms (e.g. with different links joined), distinguished by key.
+    Documents are copied on put and get, so instances of linked documents stubs and mutable values are not shared
+    between cached and read documents.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None):
+        """Initialize empty cache.
+
+        :param max_size: Maximum number of cached identities, least recently used are evicted.
+        :param ttl: Time to live of cached documents in seconds, None for unlimited.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._entries: OrderedDict[Any, dict[Hashable, tuple[float, dict[str, Any]]]] = OrderedDict()
+
+    def get(self, key: Hashable, identity: Any) -> dict[str, Any] | None:
+        """Get cached document, None if it is not cached or expired."""
+        forms = self._entries.get(identity, {})
+        entry = forms.get(key)
+
+        if entry is not None and entry[0] < time.monotonic():
+            del forms[key]
+            if not forms:
+                del self._entries[identity]
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(identity)
+        self.hits += 1
+        return deepcopy(entry[1])
+
+    def put(self, key: Hashable, identity: Any, mongo_doc: dict[str, Any]) -> None:
+        """Put document to cache, evicting least recently used ones if cache is full."""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries.setdefault(identity, {})[key] = (expires, deepcopy(mongo_doc))
+        self._entries.move_to_end(identity)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, identities: list[Any]) -> None:
+        """Remove all cached forms of documents with given identities."""
+        for identity in identities:
+            self._entries.pop(identity, None)
+
+    def clear(self) -> None:
+        """Remove all cached documents."""
+        self._entries.clear()
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(
+            size=len(self._entries),
+            hits=self.hits,
+            misses=self.misses,
+        )
+
+
+async def watch_collection(collection: AgnosticCollection[Any], resume_token: Any) -> AsyncIterator[dict[str, Any]]:
+    """Change event source reading MongoDB change stream of collection (requires replica set).
+
+    Changed documents are looked up to find their identity if it is not _id, deleted documents can be identified
+    only if pre-images are enabled for collection, otherwise whole cache is flushed on delete.
+    """
+    async with collection.watch(
+            full_document="updateLookup",
+            full_document_before_change="whenAvailable",
+            resume_after=resume_token,
+    ) as stream:
+        async for change in stream:
+            yield change
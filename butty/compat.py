@@ -3,7 +3,8 @@ from __future__ import annotations
 
 import typing
 from dataclasses import dataclass
-from typing import Annotated, Any, ForwardRef, Type, TypeAlias, TypeVar, cast
+from functools import cache, partial
+from typing import Annotated, Any, Callable, ForwardRef, Generic, Type, TypeAlias, TypeVar, cast
 
 import pydantic
 from pydantic import BaseModel, Field
@@ -115,10 +116,19 @@ def get_fields_names(model: Type[BaseModel]) -> set[FieldName]:
 
 
 def get_fields_info(model: Type[BaseModel]) -> dict[FieldName, ModelFieldInfo]:
-    return {name: get_field_info(model, name) for name in get_fields_names(model)}
+    """Fields info in order of declaration."""
+    match pydantic_version:
+        case 1:
+            names = [*model.__fields__]  # noqa
+        case 2:
+            names = [*model.model_fields]  # noqa
+        case _:
+            assert False, f"Pydantic major version {pydantic_version} is not supported"
+    return {name: get_field_info(model, name) for name in names}
 
 
 T = TypeVar("T")
+TModel = TypeVar("TModel", bound=BaseModel)
 
 
 def parse_obj_as_compat(t: Type[T], obj: Any) -> T:
@@ -135,6 +145,117 @@ def parse_obj_as_compat(t: Type[T], obj: Any) -> T:
             assert False, f"Pydantic major version {pydantic_version} is not supported"
 
 
+class TypeAdapterCompat(Generic[T]):
+    """Validator of objects against given type, which builds validation schema only once.
+
+    Pickled by type, so it can be sent to worker processes.
+    """
+
+    def __init__(self, t: Type[T]):
+        self._type = t
+        match pydantic_version:
+            case 1:
+                from pydantic import create_model  # noqa
+
+                # same as pydantic.parse_obj_as does, but built once
+                self._parsing_model = create_model(f"ParsingModel[{t}]", __root__=(t, ...))
+            case 2:
+                from pydantic import TypeAdapter  # noqa
+
+                self._type_adapter = TypeAdapter(t)
+            case _:
+                assert False, f"Pydantic major version {pydantic_version} is not supported"
+
+    def validate(self, obj: Any) -> T:
+        match pydantic_version:
+            case 1:
+                return self._parsing_model(__root__=obj).__root__
+            case 2:
+                return self._type_adapter.validate_python(obj)
+            case _:
+                assert False, f"Pydantic major version {pydantic_version} is not supported"
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return _get_type_adapter_compat, (self._type,)
+
+
+@cache
+def _get_type_adapter_compat(t: Type[T]) -> TypeAdapterCompat[T]:
+    """Adapter of type unpickled in worker process, built once per type and process."""
+    return TypeAdapterCompat(t)
+
+
+def construct_compat(model: Type[TModel], values: dict[FieldName, Any]) -> TModel:
+    """Creates model instance from trusted values by field names without validation."""
+    match pydantic_version:
+        case 1:
+            return model.construct(**values)  # noqa
+        case 2:
+            return model.model_construct(**values)  # noqa
+        case _:
+            assert False, f"Pydantic major version {pydantic_version} is not supported"
+
+
+def get_constructor_compat(model: Type[TModel]) -> Callable[[dict[FieldName, Any]], TModel]:
+    """Makes constructor of model instances from trusted values by field names without validation.
+
+    Faster than construct_compat, fields missing in values are set to defaults. Models with private attributes
+    or post init hook are constructed with construct_compat.
+    """
+    match pydantic_version:
+        case 1:
+            fields = model.__fields__  # noqa
+            if model.__private_attributes__:
+                return partial(construct_compat, model)
+
+            def construct(values: dict[FieldName, Any]) -> TModel:
+                fields_set = set(values)
+                if len(values) < len(fields):
+                    values = {
+                        name: values[name] if name in values else f.get_default()
+                        for name, f in fields.items()
+                        if name in values or not f.required
+                    }
+                instance = object.__new__(model)
+                object.__setattr__(instance, "__dict__", values)
+                object.__setattr__(instance, "__fields_set__", fields_set)
+                return instance
+
+        case 2:
+            fields = model.model_fields  # noqa
+            if any([
+                model.__private_attributes__,
+                model.__pydantic_post_init__,
+                model.model_config.get("extra") == "allow",
+            ]):
+                return partial(construct_compat, model)
+
+            # slots of BaseModel are set by their descriptors, which is faster than object.__setattr__
+            set_fields_set = BaseModel.__pydantic_fields_set__.__set__
+            set_extra = BaseModel.__pydantic_extra__.__set__
+            set_private = BaseModel.__pydantic_private__.__set__
+
+            def construct(values: dict[FieldName, Any]) -> TModel:
+                fields_set = set(values)
+                if len(values) < len(fields):
+                    values = {
+                        name: values[name] if name in values else f.get_default(call_default_factory=True)
+                        for name, f in fields.items()
+                        if name in values or not f.is_required()
+                    }
+                instance = object.__new__(model)
+                object.__setattr__(instance, "__dict__", values)
+                set_fields_set(instance, fields_set)
+                set_extra(instance, None)
+                set_private(instance, None)
+                return instance
+
+        case _:
+            assert False, f"Pydantic major version {pydantic_version} is not supported"
+
+    return construct
+
+
 def to_dict(model: BaseModel, exclude: set[str], by_alias: bool) -> dict[str, Any]:
     match pydantic_version:
         case 1:
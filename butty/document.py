@@ -12,15 +12,18 @@ from typing import (
     ClassVar,
     Generic,
     Literal,
+    Sequence,
     Type,
     TypeAlias,
     TypeVar,
     cast,
+    overload,
 )
 
 from motor.core import AgnosticCollection
 from pydantic import BaseModel
 
+from butty.compat import pydantic_version
 from butty.errors import _validate
 
 if TYPE_CHECKING:
@@ -43,6 +46,19 @@ class DocumentConfigBase:
     collection_name_from_model: Type[Document[Any]]
     """Document class whose collection should be reused (creates a collection view)."""
 
+    cache_max_size: int
+    """If set, documents are kept in in-process LRU cache of given size, links to them are served from cache."""
+
+    cache_ttl: float
+    """Time to live of cached documents in seconds (unlimited by default)."""
+
+    validate_on_read: bool
+    """If set to False, read documents are constructed from stored data without validation (validated by default)."""
+
+    track_changes: bool
+    """If set to True, stored fields of loaded and saved documents are remembered, so save() writes only changed fields
+    (documents are tracked within Engine.session() regardless)."""
+
 
 SaveMode: TypeAlias = Literal["auto", "update", "insert", "upsert"]
 """Defines the available modes for document save operations.
@@ -54,6 +70,15 @@ Possible values:
 - "upsert": Insert or update existing document (requires identity)
 """
 
+MissingPolicy: TypeAlias = Literal["raise", "skip", "none"]
+"""Defines how documents which are not found are handled while getting many documents by identities.
+
+Possible values:
+- "raise": Raise DocumentNotFound
+- "skip": Skip missing documents in result
+- "none": Put None in result in place of missing documents
+"""
+
 HookKind: TypeAlias = Literal["before_delete"]
 """Specifies the types of hooks supported by the document lifecycle.
 
@@ -84,6 +109,10 @@ class Document(BaseModel, Generic[ID_T]):
     __engine__: ClassVar[Engine]
     __collection__: ClassVar[AgnosticCollection[Any]]
 
+    if pydantic_version == 1:
+        # engine keeps weak references to loaded documents to track changes, v2 models support them already
+        __slots__ = ("__weakref__",)
+
     def __init_subclass__(cls, registry: bool | None = None, **kwargs: Any) -> None:
         """Initialize a subclass and optionally register it in the documents registry.
 
@@ -129,15 +158,54 @@ class Document(BaseModel, Generic[ID_T]):
         )
         return cast(T, await self.__class__.__engine__._save(self, mode))
 
+    @classmethod
+    async def save_many(
+            cls: Type[T],
+            docs: Sequence[T],
+            /,
+            *,
+            mode: SaveMode = "auto",
+            ordered: bool = True,
+            batch_size: int = 1000,
+    ) -> list[T]:
+        """Save many document instances to database with bulk writes.
+
+        :param docs: Document instances to save.
+        :param mode: Save operation mode, same as for save().
+        :param ordered: Stop on the first document which can not be saved,
+            otherwise save all documents which can be saved.
+        :param batch_size: Maximum number of documents in a single bulk write.
+        :return: The saved document instances (with generated identities and versions).
+        :raises:
+            - BulkSaveError: If some documents could not be saved, holds errors per document.
+        """
+        _validate(
+            hasattr(cls, "__engine__"),
+            f"Document {cls.__name__} is not bound.",
+        )
+        _validate(
+            all(isinstance(doc, cls) for doc in docs),
+            f"All documents must be instances of {cls.__name__}.",
+        )
+        return cast(list[T], await cls.__engine__._save_many(
+            docs,
+            mode,
+            ordered=ordered,
+            batch_size=batch_size,
+        ))
+
     @classmethod
     async def get(
             cls: Type[T],
             id_: ID_T,
             /,
+            *,
+            expand: Sequence[Any] | None = None,
     ) -> T:
         """Get document by its identity value.
 
         :param id_: Document identity value.
+        :param expand: Optional link fields (or alias paths) to join, other links are returned as identity stubs.
         :return: Found document.
         :raises:
             - DocumentNotFound: If document doesn't exist.
@@ -146,17 +214,78 @@ class Document(BaseModel, Generic[ID_T]):
             hasattr(cls, "__engine__"),
             f"Document {cls.__name__} is not bound.",
         )
-        return cast(T, await cls.__engine__._get(cls, id_))
+        return cast(T, await cls.__engine__._get(cls, id_, expand))
+
+    @overload
+    @classmethod
+    async def get_many(
+            cls: Type[T],
+            ids: Sequence[ID_T],
+            /,
+            *,
+            missing: Literal["raise", "skip"] = "raise",
+            expand: Sequence[Any] | None = None,
+    ) -> list[T]:
+        ...
+
+    @overload
+    @classmethod
+    async def get_many(
+            cls: Type[T],
+            ids: Sequence[ID_T],
+            /,
+            *,
+            missing: Literal["none"],
+            expand: Sequence[Any] | None = None,
+    ) -> list[T | None]:
+        ...
+
+    @classmethod
+    async def get_many(
+            cls: Type[T],
+            ids: Sequence[ID_T],
+            /,
+            *,
+            missing: MissingPolicy = "raise",
+            expand: Sequence[Any] | None = None,
+    ) -> list[T] | list[T | None]:
+        """Get documents by their identity values with a single request.
+
+        :param ids: Document identity values.
+        :param missing: How to handle documents which are not found:
+            - "raise": Raise DocumentNotFound
+            - "skip": Skip missing documents
+            - "none": Return None in place of missing documents
+        :param expand: Optional link fields (or alias paths) to join, other links are returned as identity stubs.
+        :return: Found documents in order of given identities.
+        :raises:
+            - DocumentNotFound: If some document doesn't exist and missing="raise".
+        """
+        _validate(
+            hasattr(cls, "__engine__"),
+            f"Document {cls.__name__} is not bound.",
+        )
+        _validate(
+            missing in ("raise", "skip", "none"),
+            f"Unknown missing documents policy {missing}.",
+        )
+        return cast(list[T | None], await cls.__engine__._get_many(cls, ids, missing, expand))
 
     @classmethod
     async def find_one(
             cls: Type[T],
             query: Query,
             /,
+            *,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
     ) -> T:
         """Find a single document matching the query.
 
         :param query: Query to match documents against.
+        :param expand: Optional link fields (or alias paths) to join, other links are returned as identity stubs.
+        :param validate: Optional flag whether to validate read documents, if False documents are constructed
+            from stored data without validation (DocumentConfig validate_on_read by default).
         :return: First matching document.
         :raises:
             - DocumentNotFound: If no document matches the query.
@@ -165,24 +294,30 @@ class Document(BaseModel, Generic[ID_T]):
             hasattr(cls, "__engine__"),
             f"Document {cls.__name__} is not bound.",
         )
-        return cast(T, await cls.__engine__._find_one(cls, query))
+        return cast(T, await cls.__engine__._find_one(cls, query, expand=expand, validate=validate))
 
     @classmethod
     async def find_one_or_none(
             cls: Type[T],
             query: Query,
             /,
+            *,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
     ) -> T | None:
         """Find a single document matching the query or return None if not found.
 
         :param query: Query to match documents against.
+        :param expand: Optional link fields (or alias paths) to join, other links are returned as identity stubs.
+        :param validate: Optional flag whether to validate read documents, if False documents are constructed
+            from stored data without validation (DocumentConfig validate_on_read by default).
         :return: First matching document or None if none match.
         """
         _validate(
             hasattr(cls, "__engine__"),
             f"Document {cls.__name__} is not bound.",
         )
-        return cast(T, await cls.__engine__._find_one_or_none(cls, query))
+        return cast(T, await cls.__engine__._find_one_or_none(cls, query, expand=expand, validate=validate))
 
     @classmethod
     async def find(
@@ -193,6 +328,8 @@ class Document(BaseModel, Generic[ID_T]):
             sort: Query | None = None,
             skip: int | None = None,
             limit: int | None = None,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
     ) -> list[T]:
         """Find documents matching the query.
 
@@ -200,6 +337,9 @@ class Document(BaseModel, Generic[ID_T]):
         :param sort: Optional sorting criteria.
         :param skip: Optional number of documents to skip.
         :param limit: Optional maximum number of documents to return.
+        :param expand: Optional link fields (or alias paths) to join, other links are returned as identity stubs.
+        :param validate: Optional flag whether to validate read documents, if False documents are constructed
+            from stored data without validation (DocumentConfig validate_on_read by default).
         :return: List of matching documents.
         """
         _validate(
@@ -212,6 +352,82 @@ class Document(BaseModel, Generic[ID_T]):
             sort=sort,
             skip=skip,
             limit=limit,
+            expand=expand,
+            validate=validate,
+        ))
+
+    @classmethod
+    async def find_raw(
+            cls: Type[T],
+            query: Query | None = None,
+            /,
+            *,
+            fields: Sequence[Any],
+            sort: Query | None = None,
+            skip: int | None = None,
+            limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Find given fields of documents matching the query as plain dicts, without building documents.
+
+        Only links on paths of given fields are joined.
+
+        :param query: Optional query to filter documents.
+        :param fields: Fields (or alias paths) to return, e.g. F(User.name) or F(User.department.name).
+        :param sort: Optional sorting criteria.
+        :param skip: Optional number of documents to skip.
+        :param limit: Optional maximum number of documents to return.
+        :return: List of dicts with given fields by aliases, fields of linked documents are nested.
+        """
+        _validate(
+            hasattr(cls, "__engine__"),
+            f"Document {cls.__name__} is not bound.",
+        )
+        return await cls.__engine__._find_raw(
+            cls,
+            query,
+            fields=fields,
+            sort=sort,
+            skip=skip,
+            limit=limit,
+        )
+
+    @classmethod
+    async def find_page(
+            cls: Type[T],
+            query: Query | None = None,
+            /,
+            *,
+            sort: Query | None = None,
+            after: str | None = None,
+            limit: int,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
+    ) -> tuple[list[T], str | None]:
+        """Find page of documents matching the query, paging by sort keys instead of skip.
+
+        Documents are additionally sorted by identity, so pages are stable when sort keys are not unique.
+
+        :param query: Optional query to filter documents.
+        :param sort: Optional sorting criteria, same for all pages.
+        :param after: Optional token returned with previous page, first page is returned if not given.
+        :param limit: Maximum number of documents in page.
+        :param expand: Optional link fields (or alias paths) to join, other links are returned as identity stubs.
+        :param validate: Optional flag whether to validate read documents, if False documents are constructed
+            from stored data without validation (DocumentConfig validate_on_read by default).
+        :return: Page of documents and token of next page, or None if page is last.
+        """
+        _validate(
+            hasattr(cls, "__engine__"),
+            f"Document {cls.__name__} is not bound.",
+        )
+        return cast(tuple[list[T], str | None], await cls.__engine__._find_page(
+            cls,
+            query,
+            sort=sort,
+            after=after,
+            limit=limit,
+            expand=expand,
+            validate=validate,
         ))
 
     @classmethod
@@ -223,13 +439,24 @@ class Document(BaseModel, Generic[ID_T]):
             sort: Query | None = None,
             skip: int | None = None,
             limit: int | None = None,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
+            batch_size: int | None = None,
+            prefetch: int = 1,
     ) -> AsyncIterable[T]:
         """Find documents matching the query.
 
+        Documents are fetched and validated by batches, next batches are fetched while the current one is consumed.
+
         :param query: Optional query to filter documents.
         :param sort: Optional sorting criteria.
         :param skip: Optional number of documents to skip.
         :param limit: Optional maximum number of documents to return.
+        :param expand: Optional link fields (or alias paths) to join, other links are returned as identity stubs.
+        :param validate: Optional flag whether to validate read documents, if False documents are constructed
+            from stored data without validation (DocumentConfig validate_on_read by default).
+        :param batch_size: Optional number of documents fetched at once.
+        :param prefetch: Number of batches fetched ahead, 0 to fetch next batch only when the current one is consumed.
         :return: Async iterable of matching documents.
         """
         _validate(
@@ -242,6 +469,10 @@ class Document(BaseModel, Generic[ID_T]):
             sort=sort,
             skip=skip,
             limit=limit,
+            expand=expand,
+            validate=validate,
+            batch_size=batch_size,
+            prefetch=prefetch,
         ))
 
     @classmethod
@@ -249,10 +480,13 @@ class Document(BaseModel, Generic[ID_T]):
             cls: Type[T],
             query: Query | None = None,
             /,
+            *,
+            estimated: bool = False,
     ) -> int:
         """Count documents matching the query.
 
         :param query: Optional query to filter documents.
+        :param estimated: Use fast estimate based on collection metadata (query must not be given).
         :return: Number of matching documents.
         """
         _validate(
@@ -262,6 +496,7 @@ class Document(BaseModel, Generic[ID_T]):
         return await cls.__engine__._count_documents(
             cls,
             query,
+            estimated,
         )
 
     @classmethod
@@ -273,6 +508,8 @@ class Document(BaseModel, Generic[ID_T]):
             sort: Query | None = None,
             skip: int | None = None,
             limit: int | None = None,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
     ) -> tuple[list[T], int]:
         """Find documents and get total count in one operation.
 
@@ -280,6 +517,9 @@ class Document(BaseModel, Generic[ID_T]):
         :param sort: Optional sorting criteria.
         :param skip: Optional number of documents to skip.
         :param limit: Optional maximum number of documents to return.
+        :param expand: Optional link fields (or alias paths) to join, other links are returned as identity stubs.
+        :param validate: Optional flag whether to validate read documents, if False documents are constructed
+            from stored data without validation (DocumentConfig validate_on_read by default).
         :return: Tuple of (list of matching documents, total count).
         """
         _validate(
@@ -292,6 +532,8 @@ class Document(BaseModel, Generic[ID_T]):
             sort=sort,
             skip=skip,
             limit=limit,
+            expand=expand,
+            validate=validate,
         ))
 
     @classmethod
@@ -318,9 +560,58 @@ class Document(BaseModel, Generic[ID_T]):
         )
         return cast(T, await cls.__engine__._update_document(cls, id_, update, upsert))
 
-    async def delete(self: T) -> T:
+    @classmethod
+    async def update_many(
+            cls: Type[T],
+            query: Query,
+            update: Query,
+            /,
+    ) -> int:
+        """Update all documents matching the query with a single request.
+
+        :param query: Query to filter documents, can reference linked documents.
+        :param update: Update operations i.g. Set, Inc, Push etc.
+        :return: Number of modified documents.
+        """
+        _validate(
+            hasattr(cls, "__engine__"),
+            f"Document {cls.__name__} is not bound.",
+        )
+        return await cls.__engine__._update_many(cls, query, update)
+
+    @classmethod
+    async def delete_many(
+            cls: Type[T],
+            query: Query,
+            /,
+            *,
+            transaction: bool = False,
+    ) -> int:
+        """Delete all documents matching the query.
+
+        Dependent documents are deleted as for delete(), for all matching documents at once.
+
+        :param query: Query to filter documents, can reference linked documents.
+        :param transaction: Delete all documents in a single transaction (requires replica set).
+        :return: Number of deleted documents matching the query.
+        """
+        _validate(
+            hasattr(cls, "__engine__"),
+            f"Document {cls.__name__} is not bound.",
+        )
+        return await cls.__engine__._delete_many(cls, query, transaction)
+
+    async def delete(
+            self: T,
+            *,
+            transaction: bool = False,
+    ) -> T:
         """Delete the current document fromDB.
 
+        Documents linked with cascade delete to this document and documents linked from this document
+        with propagate delete are deleted too, level by level with a single request per model.
+
+        :param transaction: Delete all documents in a single transaction (requires replica set).
         :return: The deleted document instance with None identity.
         :raises:
             - DocumentNotFound: If document doesn't exist in database.
@@ -329,7 +620,7 @@ class Document(BaseModel, Generic[ID_T]):
             hasattr(self, "__engine__"),
             f"Document {self.__class__.__name__} is not bound.",
         )
-        return cast(T, await self.__class__.__engine__._delete(self))
+        return cast(T, await self.__class__.__engine__._delete(self, transaction))
 
     # ----------------------------------------------------
     # hooks
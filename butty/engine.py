@@ -1,20 +1,64 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import asyncio
+import base64
+import logging
+import typing
+import weakref
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager, suppress
+from copy import deepcopy
+from dataclasses import dataclass, field
+from enum import Enum
 from inspect import iscoroutinefunction
-from typing import Any, AsyncGenerator, Awaitable, Callable, Literal, Type, TypeAlias, cast
-
+from types import UnionType
+from typing import (
+    Annotated,
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Literal,
+    Sequence,
+    Type,
+    TypeAlias,
+    Union,
+    cast,
+)
+
+import bson
 import pymongo
 from motor.core import AgnosticDatabase
-from pymongo import ReturnDocument
+from pydantic import BaseModel
+from pymongo import InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure, WriteError
 from pymongo.results import DeleteResult, InsertOneResult, UpdateResult
 from typing_extensions import Self
 
-from butty.compat import FieldName, ModelFieldInfo, get_fields_info, parse_obj_as_compat, to_dict
-from butty.document import Document, DocumentConfigBase, Hook, HookKind, SaveMode, _documents_registry
-from butty.errors import DocumentNotFound, _validate
-from butty.fields import KnownExtra, OnDelete
+from butty.cache import CacheStats, ChangeEventSource, DocumentCache
+from butty.compat import (
+    FieldName,
+    ModelFieldInfo,
+    TypeAdapterCompat,
+    construct_compat,
+    get_constructor_compat,
+    get_fields_info,
+    to_dict,
+)
+from butty.document import (
+    Document,
+    DocumentConfigBase,
+    Hook,
+    HookKind,
+    MissingPolicy,
+    SaveMode,
+    _documents_registry,
+)
+from butty.errors import BulkSaveError, ButtyValueError, DocumentNotFound, _validate
+from butty.fields import JoinStrategy, KnownExtra, OnDelete
 from butty.query import ButtyField, F, MongoQuery, Q, Query
+from butty.unit_of_work import UnitOfWork, current_unit_of_work
 
 MongoDoc = dict[str, Any]
 Doc: TypeAlias = Document[Any]
@@ -26,12 +70,15 @@ CollectionName: TypeAlias = str
 
 IdentityProvider: TypeAlias = Callable[[], Any] | Callable[[], Awaitable[Any]]
 IdentityProviderFactory = Callable[[DocModel], IdentityProvider]
+IdentityBatchProvider: TypeAlias = Callable[[int], Sequence[Any]] | Callable[[int], Awaitable[Sequence[Any]]]
+IdentityBatchProviderFactory = Callable[[DocModel], IdentityBatchProvider]
 
 LinkNameFormat: TypeAlias = Callable[[ModelFieldInfo], LinkName]
 CollectionNameFormat: TypeAlias = Callable[[DocModel], CollectionName]
 
 LinkType: TypeAlias = Literal["plain", "array", "dict"]
 LinkedDocs: TypeAlias = Doc | list[Doc] | dict[Any, Doc]
+ExpansionKey: TypeAlias = tuple[frozenset[FieldAlias], frozenset[FieldAlias]]
 
 VersionProvider: TypeAlias = Callable[[Any], Any]
 
@@ -46,12 +93,58 @@ class Link:
     link_name: LinkName
     link_type: LinkType
     on_delete: OnDelete
+    max_depth: int | None
+    join_strategy: JoinStrategy
 
 
 @dataclass(kw_only=True)
 class BackLink:
     local_field: ModelFieldInfo
     link_from: DocModel
+    max_depth: int | None
+
+
+@dataclass(kw_only=True)
+class SaveOperation:
+    doc: Doc
+    mode: SaveMode
+    mongo_doc: MongoDoc
+    mongo_query: MongoQuery
+    version: Any
+    update: MongoDoc | None
+    """Fields to $set in update and upsert modes, None if document is not changed since load."""
+
+
+@dataclass(kw_only=True)
+class PendingGet:
+    """Coalesced get() of document, resolved with stored data of document for each caller."""
+
+    future: asyncio.Future[list[MongoDoc]]
+    callers: int = 0
+
+
+@dataclass(kw_only=True)
+class Expansion:
+    """Pipeline which joins only selected links and back links of document model."""
+
+    key: ExpansionKey | None
+    pipeline: list[MongoQuery]
+    expanded: dict[FieldName, Expansion]
+    client_joined: dict[FieldName, Expansion]
+    has_stubs: bool
+    has_client_joins: bool
+
+
+@dataclass(kw_only=True)
+class JoinStats:
+    """Size of pipeline which joins linked documents on read."""
+
+    stages: int
+    """Number of stages, including ones of nested lookup pipelines."""
+    lookups: int
+    """Number of lookups, estimated join fan-out per read document."""
+    depth: int
+    """Maximum nesting of lookups."""
 
 
 @dataclass(kw_only=True)
@@ -59,21 +152,33 @@ class DocModelInfo:
     fields: dict[FieldName, ModelFieldInfo]
     identity: ModelFieldInfo
     identity_provider: IdentityProvider | None
+    identity_batch_provider: IdentityBatchProvider | None
     links: dict[FieldName, Link]
     back_links: dict[FieldName, BackLink]
     indexes: list[pymongo.IndexModel]
     version_field: ModelFieldInfo | None
     version_provider: VersionProvider | None
+    stored_aliases: set[FieldAlias]
+    adapter: TypeAdapterCompat[Doc]
+    list_adapter: TypeAdapterCompat[list[Doc]]
+    validate_on_read: bool
+    track_changes: bool
 
-    forward_pipeline: list[MongoQuery] | None = None
-    full_pipeline: list[MongoQuery] | None = None
+    cache: DocumentCache | None
+    cache_linked_models: set[DocModel] = field(default_factory=set)
+    cache_generation: int = 0
+    track_linked_changes: bool = False
+
+    default_expand: frozenset[FieldAlias] | None = None
+    default_expansion: Expansion | None = None
+    expansions: dict[ExpansionKey, Expansion] = field(default_factory=dict)
 
 
 global_hooks: dict[DocModel, dict[HookKind, list[Hook[Any]]]] = {}
 
 
-async def _await_or_call(f: IdentityProvider) -> Any:
-    return await f() if iscoroutinefunction(f) else f()
+async def _await_or_call(f: Callable[..., Any], *args: Any) -> Any:
+    return await f(*args) if iscoroutinefunction(f) else f(*args)
 
 
 def _get_register_hook_wrapper(cls: DocModel, hook_kind: HookKind) -> Callable[[Hook[Any]], Hook[Any]]:
@@ -98,6 +203,215 @@ async def _call_hooks(doc: Doc, hook_kind: HookKind) -> Doc:
     return doc
 
 
+def _has_before_delete(doc_model: DocModel) -> bool:
+    return doc_model.before_delete is not Document.before_delete or any(
+        "before_delete" in global_hooks.get(cls, {})
+        for cls in doc_model.mro()
+    )
+
+
+def _get_conjuncts(query: MongoQuery) -> list[MongoQuery]:
+    conjuncts: list[MongoQuery] = []
+    for k, v in query.items():
+        if k == "$and":
+            for q in v:
+                conjuncts.extend(_get_conjuncts(q))
+        else:
+            conjuncts.append({k: v})
+    return conjuncts
+
+
+_CLIENT_JOIN_BATCH_SIZE = 1000
+"""Maximum number of ids in single request loading client joined documents."""
+
+_FIND_ITER_BATCH_SIZE = 100
+"""Default number of documents fetched, validated and client joined by find_iter() at once."""
+
+_CACHE_WATCH_RETRY_DELAY = 1.0
+"""Delay in seconds before reopening change stream of cached collection after error."""
+
+_CACHE_CHANGE_OPERATIONS = {"insert", "update", "replace", "delete"}
+"""Change events of single document, other events (drop, rename, invalidate) flush caches."""
+
+_MISSING = object()
+"""Marker of field missing in stored document."""
+
+logger = logging.getLogger(__name__)
+
+
+def _get_cache_config(doc_model: DocModel) -> tuple[int | None, float | None]:
+    doc_meta: DocumentConfigBase = getattr(doc_model, "DocumentConfig", DocumentConfigBase())
+    return getattr(doc_meta, "cache_max_size", None), getattr(doc_meta, "cache_ttl", None)
+
+
+def _get_changes(stored: MongoDoc, mongo_doc: MongoDoc, prefix: str = "") -> MongoDoc:
+    """Finds fields to $set to turn stored document into given one, nested documents are updated by paths."""
+    changes: MongoDoc = {}
+    for key, value in mongo_doc.items():
+        stored_value = stored.get(key)
+        if key in stored and stored_value == value:
+            continue
+        if (
+                isinstance(value, dict)
+                and isinstance(stored_value, dict)
+                and value.keys() == stored_value.keys()
+                and all(isinstance(k, str) and k and "." not in k and not k.startswith("$") for k in value)
+        ):
+            changes.update(_get_changes(stored_value, value, prefix + key + "."))
+        else:
+            changes[prefix + key] = value
+    return changes
+
+
+def _get_union_members(t: Any) -> list[Any]:
+    """Types of union except None, empty if type is not union."""
+    if typing.get_origin(t) not in (Union, UnionType):
+        return []
+    return [a for a in typing.get_args(t) if a is not type(None)]
+
+
+def _get_join_stats(pipeline: list[MongoQuery]) -> JoinStats:
+    stats = JoinStats(stages=len(pipeline), lookups=0, depth=0)
+    for stage in pipeline:
+        if "$lookup" in stage:
+            sub_stats = _get_join_stats(stage["$lookup"].get("pipeline", []))
+            stats.stages += sub_stats.stages
+            stats.lookups += sub_stats.lookups + 1
+            stats.depth = max(stats.depth, sub_stats.depth + 1)
+        elif "$graphLookup" in stage:
+            stats.lookups += 1
+            stats.depth = max(stats.depth, 1)
+    return stats
+
+
+def _get_graph_expansion(field_name: FieldName) -> Expansion:
+    """Expansion of documents joined recursively with $graphLookup, where only recursive field is expanded."""
+    expansion = Expansion(
+        key=None,
+        pipeline=[],
+        expanded={},
+        client_joined={},
+        has_stubs=True,
+        has_client_joins=False,
+    )
+    expansion.expanded[field_name] = expansion
+    return expansion
+
+
+def _get_query_keys(query: MongoQuery) -> list[FieldAlias]:
+    """Gets field aliases used in query, including ones in logical operators."""
+    keys: list[FieldAlias] = []
+    for k, v in query.items():
+        if k in ("$and", "$or", "$nor"):
+            for sub_query in v:
+                keys.extend(_get_query_keys(sub_query))
+        elif not k.startswith("$"):
+            keys.append(k)
+    return keys
+
+
+def _make_conjunction(conjuncts: list[MongoQuery]) -> MongoQuery:
+    match len(conjuncts):
+        case 0:
+            return {}
+        case 1:
+            return conjuncts[0]
+        case _:
+            return {"$and": conjuncts}
+
+
+async def _read_batches(cursor: Any, batch_size: int) -> AsyncGenerator[list[MongoDoc]]:
+    try:
+        while batch := await cursor.to_list(batch_size):
+            yield batch
+    finally:
+        await cursor.close()
+
+
+async def _prefetch(batches: AsyncGenerator[list[MongoDoc]], prefetch: int) -> AsyncGenerator[list[MongoDoc]]:
+    """Reads up to `prefetch` batches ahead while the current one is consumed."""
+    queue: asyncio.Queue[list[MongoDoc] | Exception | None] = asyncio.Queue(prefetch)
+
+    async def read() -> None:
+        try:
+            async for batch in batches:
+                await queue.put(batch)
+            await queue.put(None)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await batches.aclose()
+
+    task = asyncio.create_task(read())
+    try:
+        while (batch := await queue.get()) is not None:
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+    finally:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+
+def _get_keyset_query(keys: list[tuple[FieldAlias, int]], values: list[Any]) -> MongoQuery:
+    """Query matching documents following the one with given values of sort keys.
+
+    Null (or missing) values go first in ascending order and last in descending one, as MongoDB sorts them.
+    """
+    disjuncts: list[MongoQuery] = []
+    for i, ((alias, direction), value) in enumerate(zip(keys, values)):
+        following: MongoQuery | None
+        if direction == 1:
+            following = {alias: {"$gt": value}} if value is not None else {alias: {"$ne": None}}
+        else:
+            following = {"$or": [{alias: {"$lt": value}}, {alias: {"$eq": None}}]} if value is not None else None
+        if following is not None:
+            equal = [{k: {"$eq": v}} for (k, _), v in zip(keys[:i], values[:i])]
+            disjuncts.append(_make_conjunction([*equal, following]))
+
+    query: MongoQuery = {"$or": disjuncts} if disjuncts else {"$expr": False}
+
+    # leading range lets index scan start from the page
+    alias, direction = keys[0]
+    if direction == 1 and values[0] is not None:
+        query = {"$and": [{alias: {"$gte": values[0]}}, query]}
+
+    return query
+
+
+def _get_path_value(mongo_doc: MongoDoc, alias: FieldAlias) -> Any:
+    value: Any = mongo_doc
+    for part in alias.split("."):
+        if not isinstance(value, dict):
+            # link which is not joined holds identity of linked document, which is the rest of the path
+            break
+        value = value.get(part)
+    return value
+
+
+def _encode_page_token(keys: list[tuple[FieldAlias, int]], values: list[Any]) -> str:
+    return base64.urlsafe_b64encode(bson.encode({"keys": keys, "values": values})).decode()
+
+
+def _decode_page_token(token: str, keys: list[tuple[FieldAlias, int]]) -> list[Any]:
+    try:
+        decoded = bson.decode(base64.urlsafe_b64decode(token.encode()))
+        token_keys = [(alias, direction) for alias, direction in decoded["keys"]]
+        values = decoded["values"]
+    except Exception:
+        raise ButtyValueError(f"Invalid page token {token}")
+    _validate(
+        isinstance(values, list) and len(values) == len(token_keys),
+        f"Invalid page token {token}",
+    )
+    _validate(
+        token_keys == keys,
+        f"Page token was made for other sort than {dict(keys)}",
+    )
+    return cast(list[Any], values)
+
+
 class Engine:
     def __init__(
             self,
@@ -105,21 +419,56 @@ class Engine:
             *,
             collection_name_format: CollectionNameFormat = lambda m: m.__name__,
             link_name_format: LinkNameFormat = lambda f: f.alias,
+            get_batch_window: float | None = None,
+            max_depth: int | None = None,
+            join_strategy: JoinStrategy = "server",
+            cache_change_source: ChangeEventSource | None = None,
+            validation_executor: Executor | None = None,
+            validation_chunk_size: int = 1000,
     ):
         """Initialize the MongoDB engine with database connection and naming formats.
 
         :param db: MongoDB database connection.
         :param collection_name_format: Function to generate collection names from models.
         :param link_name_format: Function to generate field names for links/relations.
+        :param get_batch_window: If given, Document.get() calls issued within this time window (in seconds,
+            0 for single event loop iteration) are coalesced to a single request per model. Concurrent calls
+            with the same identity share the request, each of them gets own document instance.
+        :param max_depth: If given, maximum number of link and backlink levels joined by read operations
+            by default, linked documents beyond are returned as identity stubs (see also LinkField max_depth).
+        :param join_strategy: How linked documents are joined on read, unless set for link by LinkField.
+        :param cache_change_source: If given, document caches are invalidated by change events of collections
+            of cached and linked models read from this source (e.g. butty.cache.watch_collection), so changes
+            made by other processes are seen. Watching starts on init().
+        :param validation_executor: If given, read results of more than validation_chunk_size documents are split
+            to chunks of this size, which are validated in this executor concurrently, so event loop is not blocked
+            (e.g. ThreadPoolExecutor, or ProcessPoolExecutor for models importable by worker processes).
+        :param validation_chunk_size: Number of documents validated in validation_executor at once.
         """
+        _validate(
+            validation_chunk_size > 0,
+            f"Validation chunk size must be positive, {validation_chunk_size} given",
+        )
         self.db = db
         self.collection_name_format = collection_name_format
         self.link_name_format = link_name_format
+        self.get_batch_window = get_batch_window
+        self.max_depth = max_depth
+        self.join_strategy = join_strategy
+        self.cache_change_source = cache_change_source
+        self.validation_executor = validation_executor
+        self.validation_chunk_size = validation_chunk_size
 
         self.doc_models_info: dict[DocModel, DocModelInfo] = {}
 
         self.cascade_delete_graph: dict[DocModelTo, dict[DocModelFrom, Link]] = {}
 
+        self._pending_gets: dict[DocModel, dict[Any, PendingGet]] = {}
+        self._get_batch_tasks: set[asyncio.Task[None]] = set()
+        self._cache_watch_tasks: set[asyncio.Task[None]] = set()
+        self._snapshots: dict[int, tuple[weakref.ref[Doc], MongoDoc]] = {}
+        self._model_constructors: dict[Type[BaseModel], Callable[[Any], Any]] = {}
+
     def bind(self, *documents: DocModel) -> Self:
         """Bind document models to this engine instance.
 
@@ -148,10 +497,17 @@ class Engine:
             ButtyField._inject(doc_model)
 
         for doc_model in doc_models:
-            self._make_forward_pipline(doc_model)
+            self._make_default_expansion(doc_model)
+
+        for doc_model in doc_models:
+            if (cache_info := self.doc_models_info[doc_model]).cache is not None:
+                cache_info.cache_linked_models = self._get_linked_models(doc_model)
 
         for doc_model in doc_models:
-            self._make_full_pipline(doc_model)
+            tracked_info = self.doc_models_info[doc_model]
+            tracked_info.track_linked_changes = tracked_info.track_changes or any(
+                self.doc_models_info[m].track_changes for m in self._get_linked_models(doc_model)
+            )
 
         return self
 
@@ -160,29 +516,102 @@ class Engine:
 
         :return: The engine instance for chaining.
         """
+        for task in self._cache_watch_tasks:
+            task.cancel()
+        self._cache_watch_tasks.clear()
+
         for doc_model in [*self.doc_models_info]:
             delattr(doc_model, "__engine__")
             del self.doc_models_info[doc_model]
         return self
 
+    def explain_joins(self) -> dict[str, JoinStats]:
+        """Report size of pipelines joining linked documents on read for all bound models, for debugging.
+
+        :return: Join statistics by document model name.
+        """
+        return {
+            doc_model.__name__: _get_join_stats(model_info.default_expansion.pipeline)
+            for doc_model, model_info in self.doc_models_info.items()
+            if model_info.default_expansion is not None
+        }
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """Report usage of caches of bound models with cache configured.
+
+        :return: Cache statistics by document model name.
+        """
+        return {
+            doc_model.__name__: model_info.cache.get_stats()
+            for doc_model, model_info in self.doc_models_info.items()
+            if model_info.cache is not None
+        }
+
     async def init(self) -> Self:
-        """Initialize the engine by creating database indexes.
+        """Initialize the engine by creating database indexes and starting to watch changes for caches.
 
         :return: The engine instance for chaining.
         """
         await self._create_indexes()
+        self._start_cache_watch()
         return self
 
+    async def bulk_save(
+            self,
+            docs: Sequence[Doc],
+            *,
+            mode: SaveMode = "auto",
+            ordered: bool = True,
+            batch_size: int = 1000,
+    ) -> list[Doc]:
+        """Save documents of any bound models with bulk writes, documents are grouped by model.
+
+        :param docs: Document instances to save.
+        :param mode: Save operation mode, same as for Document.save().
+        :param ordered: Stop on the first document which can not be saved (order is kept within model),
+            otherwise save all documents which can be saved.
+        :param batch_size: Maximum number of documents in a single bulk write.
+        :return: The saved document instances (with generated identities and versions).
+        :raises:
+            - BulkSaveError: If some documents could not be saved, holds errors per document.
+        """
+        return await self._save_many(docs, mode, ordered=ordered, batch_size=batch_size)
+
+    @asynccontextmanager
+    async def session(
+            self,
+            *,
+            transaction: bool = False,
+            batch_size: int = 1000,
+    ) -> AsyncIterator[UnitOfWork]:
+        """Open unit of work scope with identity map of loaded documents.
+
+        Within scope, documents loaded by read operations are kept by model and identity: loading already loaded
+        document returns the same instance, get() of it does not request database. On exit w/o exception, documents
+        changed since load and documents added with UnitOfWork.add() are saved with bulk writes.
+
+        :param transaction: Save documents within MongoDB transaction (requires replica set).
+        :param batch_size: Maximum number of documents in a single bulk write.
+        :return: Unit of work of the scope.
+        :raises:
+            - BulkSaveError: If some documents could not be saved on exit.
+        """
+        unit = UnitOfWork()
+        token = current_unit_of_work.set(unit)
+        try:
+            yield unit
+            await self._flush_unit_of_work(unit, transaction, batch_size)
+        finally:
+            current_unit_of_work.reset(token)
+
     # ----------------------------------------------------
     # internal API
 
-    async def _save(
+    def _get_mongo_doc(
             self,
             doc: Doc,
-            mode: SaveMode,
-    ) -> Doc:
-        doc_model = doc.__class__
-        info = self.doc_models_info[doc_model]
+    ) -> MongoDoc:
+        info = self.doc_models_info[doc.__class__]
 
         mongo_doc = to_dict(
             doc,
@@ -224,6 +653,23 @@ class Engine:
 
             mongo_doc[link.link_name] = linked_ids
 
+        return mongo_doc
+
+    async def _get_save_operation(
+            self,
+            doc: Doc,
+            mode: SaveMode,
+            reserved_identity: Any = None,
+    ) -> SaveOperation:
+        """Builds operation saving document.
+
+        :param reserved_identity: Identity reserved for document if it is saved w/o id, otherwise identity is taken from
+            identity provider.
+        """
+        info = self.doc_models_info[doc.__class__]
+
+        mongo_doc = self._get_mongo_doc(doc)
+
         is_mongo_id = info.identity.alias == "_id"
         identity = mongo_doc[info.identity.alias]
 
@@ -240,18 +686,20 @@ class Engine:
             )
 
             if not is_mongo_id:
-                _validate(
-                    info.identity_provider is not None,
-                    f"Identity provider must be given for {doc.__class__.__name__} while saving w/o id",
-                )
-                assert info.identity_provider is not None
-                identity = await _await_or_call(info.identity_provider)
+                if reserved_identity is None:
+                    _validate(
+                        info.identity_provider is not None,
+                        f"Identity provider must be given for {doc.__class__.__name__} while saving w/o id",
+                    )
+                    assert info.identity_provider is not None
+                    reserved_identity = await _await_or_call(info.identity_provider)
+                identity = reserved_identity
                 mongo_doc[info.identity.alias] = identity
-                setattr(doc, info.identity.name, identity)
             else:
                 del mongo_doc["_id"]
 
         mongo_query = {info.identity.alias: identity}
+        version = None
 
         if info.version_field is not None:
             _validate(
@@ -261,9 +709,8 @@ class Engine:
             assert info.version_provider is not None
 
             prev_version = mongo_doc.get(info.version_field.alias)
-            new_version = info.version_provider(prev_version)
-            mongo_doc[info.version_field.alias] = new_version
-            setattr(doc, info.version_field.name, new_version)
+            version = info.version_provider(prev_version)
+            mongo_doc[info.version_field.alias] = version
 
             if prev_version is not None:
                 _validate(
@@ -277,43 +724,657 @@ class Engine:
                     f"Version must be set while saving {doc.__class__.__name__} in '{mode}' mode",
                 )
 
-        match mode:
-            case "update" | "upsert":
-                _validate(
-                    identity is not None,
-                    f"Identity must be provided while saving {doc.__class__.__name__} in '{mode}' mode",
+        if mode in ("update", "upsert"):
+            _validate(
+                identity is not None,
+                f"Identity must be provided while saving {doc.__class__.__name__} in '{mode}' mode",
+            )
+
+        update: MongoDoc | None = mongo_doc
+        snapshot = self._get_snapshot(doc)
+        if mode == "update" and snapshot is not None and snapshot.get(info.identity.alias) == identity:
+            version_alias = info.version_field.alias if info.version_field is not None else None
+            update = _get_changes(snapshot, {k: v for k, v in mongo_doc.items() if k != version_alias})
+            if not update:
+                update = None
+                # version is not changed if document is not written
+                if version_alias is not None:
+                    version = mongo_doc[version_alias] = snapshot.get(version_alias)
+            elif version_alias is not None:
+                update[version_alias] = version
+
+        return SaveOperation(
+            doc=doc,
+            mode=mode,
+            mongo_doc=mongo_doc,
+            mongo_query=mongo_query,
+            version=version,
+            update=update,
+        )
+
+    def _apply_save_operation(
+            self,
+            op: SaveOperation,
+    ) -> None:
+        """Sets identity and version of saved document, removes it from caches and tracks it as loaded one."""
+        info = self.doc_models_info[op.doc.__class__]
+        setattr(op.doc, info.identity.name, op.mongo_doc[info.identity.alias])
+        self._invalidate_cache(op.doc.__class__, [op.mongo_doc[info.identity.alias]])
+        if info.version_field is not None:
+            setattr(op.doc, info.version_field.name, op.version)
+
+        unit = current_unit_of_work.get()
+        if info.track_changes or unit is not None:
+            self._set_snapshot(op.doc, op.mongo_doc)
+        if unit is not None:
+            unit.identity_map.setdefault((op.doc.__class__, op.mongo_doc[info.identity.alias]), op.doc)
+
+    async def _flush_unit_of_work(
+            self,
+            unit: UnitOfWork,
+            transaction: bool,
+            batch_size: int,
+    ) -> None:
+        """Saves documents added to unit of work and documents changed since load, unchanged ones are skipped.
+
+        Documents are saved in rounds by link dependencies: document linking to pending documents w/o identity is
+        saved in the round after them, when their identities are set.
+        """
+        new_ids = {id(doc) for doc in unit.new_docs}
+        docs = [*unit.new_docs]
+        docs.extend(doc for doc in unit.identity_map.values() if id(doc) not in new_ids)
+
+        if not docs:
+            return
+
+        async def save_rounds(session: Any = None) -> None:
+            saved: list[int] = []
+            for indices in self._get_save_rounds(docs):
+                try:
+                    await self._save_many(
+                        [docs[i] for i in indices],
+                        "auto",
+                        ordered=True,
+                        batch_size=batch_size,
+                        session=session,
+                    )
+                except BulkSaveError as e:
+                    raise BulkSaveError(
+                        {indices[i]: error for i, error in e.errors.items()},
+                        sorted([*saved, *(indices[i] for i in e.saved)]),
+                    ) from e
+                saved.extend(indices)
+
+        if transaction:
+            async with await self.db.client.start_session() as session:
+                async with session.start_transaction():
+                    await save_rounds(session)
+        else:
+            await save_rounds()
+
+    def _get_save_rounds(
+            self,
+            docs: list[Doc],
+    ) -> list[list[int]]:
+        """Splits indices of documents to rounds of saving, so documents w/o identity are saved in rounds before
+        documents linking them. Documents of cyclic links w/o identities can not be saved and fail on saving.
+        """
+        pending = {id(doc) for doc in docs}
+        depths: dict[int, int] = {}
+
+        def is_pending_new(doc: Doc) -> bool:
+            info = self.doc_models_info.get(doc.__class__)
+            return id(doc) in pending and info is not None and getattr(doc, info.identity.name) is None
+
+        def get_depth(doc: Doc) -> int:
+            if id(doc) not in depths:
+                depths[id(doc)] = 0  # breaks cycles
+                depths[id(doc)] = max(
+                    (
+                        get_depth(linked_doc) + 1
+                        for linked_doc in self._get_linked_docs(doc)
+                        if is_pending_new(linked_doc)
+                    ),
+                    default=0,
                 )
+            return depths[id(doc)]
+
+        rounds: list[list[int]] = []
+        for i, doc in enumerate(docs):
+            depth = get_depth(doc)
+            rounds.extend([] for _ in range(depth + 1 - len(rounds)))
+            rounds[depth].append(i)
+        return rounds
+
+    def _get_linked_docs(
+            self,
+            doc: Doc,
+    ) -> list[Doc]:
+        """Documents linked by links of document, unbound document has none."""
+        info = self.doc_models_info.get(doc.__class__)
+        if info is None:
+            return []
+
+        linked_docs: list[Doc] = []
+        for link in info.links.values():
+            value = getattr(doc, link.local_field.name, None)
+            if value is None:
+                continue
+            match link.link_type:
+                case "plain":
+                    linked_docs.append(value)
+                case "array":
+                    linked_docs.extend(value)
+                case "dict":
+                    linked_docs.extend(value.values())
+        return linked_docs
+
+    def _get_snapshot(self, doc: Doc) -> MongoDoc | None:
+        """Stored fields of document as they were loaded or saved, None if document is not loaded."""
+        entry = self._snapshots.get(id(doc))
+        return entry[1] if entry is not None and entry[0]() is doc else None
+
+    def _set_snapshot(self, doc: Doc, mongo_doc: MongoDoc) -> None:
+        key = id(doc)
+        self._snapshots[key] = (weakref.ref(doc, lambda _: self._snapshots.pop(key, None)), mongo_doc)
+
+    def _track_doc(
+            self,
+            doc_model: DocModel,
+            expansion: Expansion,
+            doc: Doc,
+    ) -> Doc:
+        """Snapshots stored fields of loaded document, so only changed ones are saved, and returns its instance
+        from identity map of current unit of work, registering it if not there.
+
+        Documents are snapshotted only within unit of work or if their model tracks changes, as snapshot costs about
+        as much as dump of document. Linked documents joined by expansion are tracked too, so the same document is
+        the same instance everywhere. Links joined for already mapped document are set to its instance, unless they
+        were changed there.
+        """
+        model_info = self.doc_models_info[doc_model]
+        unit = current_unit_of_work.get()
+        if unit is None and not model_info.track_linked_changes:
+            return doc
+
+        target = doc
+        if unit is not None:
+            key = (doc_model, getattr(doc, model_info.identity.name))
+            mapped = unit.identity_map.get(key)
+            expansions = unit.expansions.setdefault(key, [])
+            # stub of last document of $graphLookup chain is replaced by loaded document
+            is_stub = bool(expansions) and all(e.key is None for e in expansions)
+            if mapped is not None and (mapped is doc or expansion.key is None or not is_stub):
+                target = mapped
+            else:
+                unit.identity_map[key] = doc
+                expansions.clear()
+            expansions.append(expansion)
+
+        # instance is snapshotted once, as it can be reached by several links
+        if target is doc and (unit is not None or model_info.track_changes) and self._get_snapshot(doc) is None:
+            self._set_snapshot(doc, self._get_mongo_doc(doc))
+
+        # last documents of $graphLookup chain can be stubs
+        if expansion.key is None:
+            return target
+
+        for field_name, link in model_info.links.items():
+            link_expansion = expansion.expanded.get(field_name) or expansion.client_joined.get(field_name)
+            value = getattr(doc, field_name, None)
+            if link_expansion is None or value is None:
+                continue
+            match link.link_type:
+                case "plain":
+                    tracked = self._track_doc(link.link_to, link_expansion, value)
+                case "array":
+                    # containers are rebuilt with their own type, as links can be declared as tuples
+                    tracked = type(value)(self._track_doc(link.link_to, link_expansion, v) for v in value)
+                case "dict":
+                    tracked = type(value)(
+                        (k, self._track_doc(link.link_to, link_expansion, v)) for k, v in value.items()
+                    )
+            target_ids = self._get_link_ids(link, getattr(target, field_name, None))
+            if target is doc or target_ids == self._get_link_ids(link, value):
+                setattr(target, field_name, tracked)
+
+        for field_name, back_link in model_info.back_links.items():
+            back_link_expansion = expansion.expanded.get(field_name)
+            value = getattr(doc, field_name, None)
+            if back_link_expansion is not None and value is not None:
+                setattr(target, field_name, type(value)(
+                    self._track_doc(back_link.link_from, back_link_expansion, v) for v in value
+                ))
+
+        return target
+
+    def _get_link_ids(
+            self,
+            link: Link,
+            value: LinkedDocs | None,
+    ) -> Any:
+        """Identities of linked documents in the shape of link value."""
+        identity_name = self.doc_models_info[link.link_to].identity.name
+        if value is None:
+            return None
+        match link.link_type:
+            case "plain":
+                return getattr(value, identity_name, None)
+            case "array":
+                return [getattr(v, identity_name, None) for v in cast(Sequence[Doc], value)]
+            case "dict":
+                return {k: getattr(v, identity_name, None) for k, v in cast(dict[Any, Doc], value).items()}
+
+    def _is_expanded(
+            self,
+            unit: UnitOfWork,
+            doc_model: DocModel,
+            doc: Doc,
+            expansion: Expansion,
+    ) -> bool:
+        """Checks that document mapped by unit of work has links and back links of expansion joined."""
+        key = (doc_model, getattr(doc, self.doc_models_info[doc_model].identity.name))
+        if unit.identity_map.get(key) is not doc:
+            return False
+        if expansion.key is None:
+            return True
+
+        expansions = unit.expansions.get(key, [])
+        model_info = self.doc_models_info[doc_model]
+
+        def get_joined(field_name: FieldName) -> list[Doc] | None:
+            """Joined documents of field, None if field was not joined."""
+            if not any(field_name in e.expanded or field_name in e.client_joined for e in expansions):
+                return None
+            value = getattr(doc, field_name, None)
+            if isinstance(value, dict):
+                return [*value.values()]
+            if isinstance(value, (list, tuple)):
+                return [*value]
+            return [] if value is None else [value]
+
+        for field_name, link in model_info.links.items():
+            link_expansion = expansion.expanded.get(field_name) or expansion.client_joined.get(field_name)
+            if link_expansion is None:
+                continue
+            if (joined := get_joined(field_name)) is None:
+                return False
+            if not all(self._is_expanded(unit, link.link_to, v, link_expansion) for v in joined):
+                return False
+
+        for field_name, back_link in model_info.back_links.items():
+            back_link_expansion = expansion.expanded.get(field_name)
+            if back_link_expansion is None:
+                continue
+            if (joined := get_joined(field_name)) is None:
+                return False
+            if not all(self._is_expanded(unit, back_link.link_from, v, back_link_expansion) for v in joined):
+                return False
+
+        return True
+
+    def _forget_docs(
+            self,
+            doc_model: DocModel,
+            ids: list[Any] | None,
+    ) -> None:
+        """Removes documents changed bypassing instances (updated or deleted) from identity map of unit of work,
+        all documents of model if ids are unknown."""
+        if (unit := current_unit_of_work.get()) is None:
+            return
+        if ids is None:
+            unit.identity_map = {k: doc for k, doc in unit.identity_map.items() if k[0] is not doc_model}
+            unit.expansions = {k: e for k, e in unit.expansions.items() if k[0] is not doc_model}
+        for id_ in ids or []:
+            unit.identity_map.pop((doc_model, id_), None)
+            unit.expansions.pop((doc_model, id_), None)
+
+    async def _save(
+            self,
+            doc: Doc,
+            mode: SaveMode,
+    ) -> Doc:
+        doc_model = doc.__class__
+        info = self.doc_models_info[doc_model]
+
+        op = await self._get_save_operation(doc, mode)
+        if op.update is None:
+            return doc
+
+        match op.mode:
+            case "update" | "upsert":
                 update_result: UpdateResult = await doc_model.__collection__.update_one(
-                    mongo_query,
-                    {"$set": mongo_doc},
-                    upsert=(mode == "upsert"),
+                    op.mongo_query,
+                    {"$set": op.update},
+                    upsert=(op.mode == "upsert"),
                 )
-                if not update_result.matched_count:
-                    raise DocumentNotFound(doc_model, "save", mongo_query)
+                if not update_result.matched_count and update_result.upserted_id is None:
+                    raise DocumentNotFound(doc_model, "save", op.mongo_query)
 
             case "insert":
-                insert_result: InsertOneResult = await doc_model.__collection__.insert_one(mongo_doc)
-                if is_mongo_id and identity is None:
-                    identity = insert_result.inserted_id
-                    mongo_doc[info.identity.alias] = identity
-                    setattr(doc, info.identity.name, identity)
+                insert_result: InsertOneResult = await doc_model.__collection__.insert_one(op.mongo_doc)
+                if info.identity.alias == "_id":
+                    op.mongo_doc["_id"] = insert_result.inserted_id
 
+        self._apply_save_operation(op)
         return doc
 
+    async def _save_many(
+            self,
+            docs: Sequence[Doc],
+            mode: SaveMode,
+            *,
+            ordered: bool,
+            batch_size: int,
+            session: Any = None,
+    ) -> list[Doc]:
+        _validate(
+            batch_size > 0,
+            f"Batch size must be positive, {batch_size} given",
+        )
+
+        indices_by_model: dict[DocModel, list[int]] = {}
+        for i, doc in enumerate(docs):
+            _validate(
+                doc.__class__ in self.doc_models_info,
+                f"Document {doc.__class__.__name__} is not bound",
+            )
+            indices_by_model.setdefault(doc.__class__, []).append(i)
+
+        errors: dict[int, Exception] = {}
+        saved: list[int] = []
+
+        for doc_model, indices in indices_by_model.items():
+            for batch_start in range(0, len(indices), batch_size):
+                batch = indices[batch_start:batch_start + batch_size]
+                batch_saved, batch_errors = await self._save_batch(
+                    doc_model,
+                    [(i, docs[i]) for i in batch],
+                    mode,
+                    ordered=ordered,
+                    session=session,
+                )
+                saved.extend(batch_saved)
+                errors.update(batch_errors)
+
+                if ordered and errors:
+                    raise BulkSaveError(errors, sorted(saved))
+
+        if errors:
+            raise BulkSaveError(errors, sorted(saved))
+
+        return [*docs]
+
+    async def _save_batch(
+            self,
+            doc_model: DocModel,
+            docs: list[tuple[int, Doc]],
+            mode: SaveMode,
+            *,
+            ordered: bool,
+            session: Any = None,
+    ) -> tuple[list[int], dict[int, Exception]]:
+        """Saves batch of documents of single model with one bulk write.
+
+        :return: Indices of saved documents and errors by indices of not saved ones.
+        """
+        info = self.doc_models_info[doc_model]
+
+        ops: list[tuple[int, SaveOperation]] = []
+        errors: dict[int, Exception] = {}
+
+        unchanged: list[int] = []
+
+        # identities of new documents are reserved at once, ones not used due to errors are lost
+        reserved_identities: dict[int, Any] = {}
+        if info.identity_batch_provider is not None and mode in ("insert", "auto"):
+            new_docs = [i for i, doc in docs if getattr(doc, info.identity.name) is None]
+            if new_docs:
+                identities = await _await_or_call(info.identity_batch_provider, len(new_docs))
+                _validate(
+                    len(identities) == len(new_docs),
+                    f"Identity batch provider of {doc_model.__name__} returned {len(identities)} identities"
+                    f" for {len(new_docs)} documents",
+                )
+                reserved_identities = dict(zip(new_docs, identities))
+
+        for i, doc in docs:
+            try:
+                op = await self._get_save_operation(doc, mode, reserved_identities.get(i))
+            except ButtyValueError as e:
+                errors[i] = e
+                if ordered:
+                    break
+            else:
+                if op.update is None:
+                    unchanged.append(i)
+                else:
+                    ops.append((i, op))
+
+        if not ops:
+            return [i for i in unchanged if not ordered or not errors or i < min(errors)], errors
+
+        # driver sets _id of inserted documents in place
+        requests: list[InsertOne[MongoDoc] | UpdateOne] = [
+            InsertOne(op.mongo_doc)
+            if op.mode == "insert" else
+            UpdateOne(op.mongo_query, {"$set": op.update}, upsert=(op.mode == "upsert"))
+            for _, op in ops
+        ]
+
+        bulk_result: MongoDoc
+        try:
+            bulk_result = (
+                await doc_model.__collection__.bulk_write(requests, ordered=ordered, session=session)
+            ).bulk_api_result
+        except BulkWriteError as e:
+            bulk_result = cast(MongoDoc, e.details)
+
+        write_errors: dict[int, MongoDoc] = {err["index"]: err for err in bulk_result["writeErrors"]}
+        upserted = {upsert["index"] for upsert in bulk_result["upserted"]}
+
+        # ordered bulk write stops on first error
+        executed = {
+            k
+            for k in range(len(ops))
+            if k not in write_errors
+            if not ordered or not write_errors or k < min(write_errors)
+        }
+
+        # bulk write reports only total number of matched documents,
+        # so updates which did not match are found by stored versions
+        not_matched: set[int] = set()
+        updates = [k for k in sorted(executed) if ops[k][1].mode != "insert" if k not in upserted]
+        if bulk_result["nMatched"] < len(updates):
+            version_alias = info.version_field.alias if info.version_field is not None else None
+            stored_versions = {
+                d[info.identity.alias]: d.get(version_alias) if version_alias is not None else None
+                async for d in doc_model.__collection__.find(
+                    {info.identity.alias: {"$in": [ops[k][1].mongo_doc[info.identity.alias] for k in updates]}},
+                    {info.identity.alias: 1} | ({version_alias: 1} if version_alias is not None else {}),
+                    session=session,
+                )
+            }
+            for k in updates:
+                op = ops[k][1]
+                identity = op.mongo_doc[info.identity.alias]
+                if identity not in stored_versions or stored_versions[identity] != op.version:
+                    not_matched.add(k)
+
+        saved: list[int] = []
+        for k, (i, op) in enumerate(ops):
+            if k in write_errors:
+                err = write_errors[k]
+                error_class = DuplicateKeyError if err["code"] == 11000 else WriteError
+                errors[i] = error_class(err["errmsg"], err["code"], err)
+            elif k in not_matched:
+                errors[i] = DocumentNotFound(doc_model, "save", op.mongo_query)
+            elif k in executed:
+                self._apply_save_operation(op)
+                saved.append(i)
+
+        # unchanged documents after the first error are not saved in ordered mode either
+        saved.extend(i for i in unchanged if not ordered or not errors or i < min(errors))
+        return saved, errors
+
+    def _check_ids(self, doc_model: DocModel, ids: Sequence[Any]) -> None:
+        """Checks that identity values are of identity field type, as ones of other type never match."""
+        id_type = self.doc_models_info[doc_model].identity.annotation.core_type
+        if not isinstance(id_type, type):
+            return
+        for id_ in ids:
+            _validate(
+                isinstance(id_, id_type),
+                f"Identity of {doc_model.__name__} must be {id_type.__name__}, {id_!r} given",
+            )
+
     async def _get(
             self,
             doc_model: DocModel,
             id_: Any,
+            expand: Sequence[Any] | None = None,
     ) -> Doc:
+        self._check_ids(doc_model, [id_])
+        unit = current_unit_of_work.get()
+        if unit is not None and (doc := unit.identity_map.get((doc_model, id_))) is not None:
+            # document mapped w/o requested links is loaded again, and its links are set to mapped instance
+            if self._is_expanded(unit, doc_model, doc, self._get_find_expansion(doc_model, None, None, expand)):
+                return doc
+
+        if self.get_batch_window is not None and expand is None:
+            # shield shared future from cancellation of a single caller
+            mongo_docs = await asyncio.shield(self._get_batched(doc_model, id_))
+            # each caller gets own instance, documents are not shared between requests
+            doc = self._validate_doc(doc_model, mongo_docs.pop())
+            return self._track_doc(doc_model, self._get_find_expansion(doc_model, None, None, None), doc)
+
+        info = self.doc_models_info[doc_model]
+        if info.cache is not None:
+            expansion = self._get_find_expansion(doc_model, None, None, expand)
+            if (mongo_doc := info.cache.get(expansion.key, id_)) is not None:
+                return self._track_doc(doc_model, expansion, self._validate_doc(doc_model, mongo_doc))
+
+        return await self._find_one(doc_model, F(getattr(doc_model, info.identity.name)) == id_, expand=expand)
+
+    def _get_batched(
+            self,
+            doc_model: DocModel,
+            id_: Any,
+    ) -> asyncio.Future[list[MongoDoc]]:
+        loop = asyncio.get_running_loop()
+
+        pending = self._pending_gets.get(doc_model)
+        if pending is None:
+            pending = self._pending_gets[doc_model] = {}
+            if self.get_batch_window:
+                loop.call_later(self.get_batch_window, self._flush_gets, doc_model)
+            else:
+                loop.call_soon(self._flush_gets, doc_model)
+
+        if id_ not in pending:
+            pending[id_] = PendingGet(future=loop.create_future())
+
+        pending[id_].callers += 1
+        return pending[id_].future
+
+    def _flush_gets(
+            self,
+            doc_model: DocModel,
+    ) -> None:
+        task = asyncio.ensure_future(self._resolve_gets(doc_model, self._pending_gets.pop(doc_model)))
+        self._get_batch_tasks.add(task)
+        task.add_done_callback(self._get_batch_tasks.discard)
+
+    async def _resolve_gets(
+            self,
+            doc_model: DocModel,
+            pending: dict[Any, PendingGet],
+    ) -> None:
+        """Loads stored data of documents requested by coalesced get() calls, with separate copy for each caller."""
+        try:
+            info = self.doc_models_info[doc_model]
+            expansion = self._get_find_expansion(doc_model, None, None, None)
+            mongo_docs = await self._load_client_joined(doc_model, expansion, [*pending], None)
+
+            for id_, pending_get in pending.items():
+                if pending_get.future.done():
+                    continue
+                if (mongo_doc := mongo_docs.get(id_)) is None:
+                    pending_get.future.set_exception(DocumentNotFound(doc_model, "get", {info.identity.alias: id_}))
+                else:
+                    pending_get.future.set_result([
+                        mongo_doc,
+                        *(deepcopy(mongo_doc) for _ in range(pending_get.callers - 1)),
+                    ])
+        except Exception as e:
+            for pending_get in pending.values():
+                if not pending_get.future.done():
+                    pending_get.future.set_exception(e)
+        finally:
+            # callers are not left waiting if resolving is cancelled or interrupted
+            for pending_get in pending.values():
+                if not pending_get.future.done():
+                    pending_get.future.cancel()
+
+    async def _get_many(
+            self,
+            doc_model: DocModel,
+            ids: Sequence[Any],
+            missing: MissingPolicy,
+            expand: Sequence[Any] | None = None,
+    ) -> list[Doc | None]:
+        self._check_ids(doc_model, ids)
         info = self.doc_models_info[doc_model]
-        return await self._find_one(doc_model, F(getattr(doc_model, info.identity.name)) == id_)
+        docs: dict[Any, Doc] = {}
+        missed_ids = [*dict.fromkeys(ids)]
+
+        if (unit := current_unit_of_work.get()) is not None:
+            expansion = self._get_find_expansion(doc_model, None, None, expand)
+            docs = {
+                id_: doc
+                for id_ in missed_ids
+                if (doc := unit.identity_map.get((doc_model, id_))) is not None
+                and self._is_expanded(unit, doc_model, doc, expansion)
+            }
+            missed_ids = [id_ for id_ in missed_ids if id_ not in docs]
+
+        if info.cache is not None:
+            expansion = self._get_find_expansion(doc_model, None, None, expand)
+            cached_ids, missed_ids = missed_ids, []
+            for id_ in cached_ids:
+                if (mongo_doc := info.cache.get(expansion.key, id_)) is not None:
+                    docs[id_] = self._track_doc(doc_model, expansion, self._validate_doc(doc_model, mongo_doc))
+                else:
+                    missed_ids.append(id_)
+
+        if missed_ids:
+            query = {info.identity.alias: {"$in": missed_ids}}
+            docs.update(
+                (getattr(doc, info.identity.name), doc)
+                for doc in await self._find(doc_model, query, expand=expand)
+            )
+
+        res: list[Doc | None] = []
+        for id_ in ids:
+            doc = docs.get(id_)
+            if doc is None:
+                match missing:
+                    case "raise":
+                        raise DocumentNotFound(doc_model, "get_many", {info.identity.alias: id_})
+                    case "skip":
+                        continue
+            res.append(doc)
+        return res
 
     async def _find_one(
             self,
             doc_model: DocModel,
             query: Query,
+            *,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
     ) -> Doc:
-        res = await self._find_one_or_none(doc_model, query)
+        res = await self._find_one_or_none(doc_model, query, expand=expand, validate=validate)
         if res is None:
             raise DocumentNotFound(doc_model, "find_one", query)
         return res
@@ -322,8 +1383,98 @@ class Engine:
             self,
             doc_model: DocModel,
             query: Query,
+            *,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
     ) -> Doc | None:
-        return res[0] if (res := await self._find(doc_model, query, limit=1)) else None
+        res = await self._find(doc_model, query, limit=1, expand=expand, validate=validate)
+        return res[0] if res else None
+
+    def _get_stored_alias(
+            self,
+            model_info: DocModelInfo,
+            alias: FieldAlias,
+    ) -> FieldAlias | None:
+        """Maps field alias of joined document to alias in stored document, None if alias requires join."""
+        head, _, rest = alias.partition(".")
+
+        for link in model_info.links.values():
+            if link.local_field.alias != head:
+                continue
+
+            # only identity of linked document is available w/o join
+            identity_alias = self.doc_models_info[link.link_to].identity.alias
+            if rest == identity_alias:
+                return link.link_name
+
+            item, _, rest = rest.partition(".")
+            if link.link_type != "plain" and item and rest == identity_alias:
+                return link.link_name + "." + item
+
+            return None
+
+        if head == "_id" or head in model_info.stored_aliases:
+            return alias
+
+        return None
+
+    def _get_stored_query(
+            self,
+            model_info: DocModelInfo,
+            query: MongoQuery,
+    ) -> MongoQuery | None:
+        """Rewrites query to be matched against stored documents, None if query requires join."""
+        stored_query: MongoQuery = {}
+
+        for k, v in query.items():
+            if k in ("$and", "$or", "$nor"):
+                sub_queries = [self._get_stored_query(model_info, q) for q in v]
+                if any(q is None for q in sub_queries):
+                    return None
+                stored_query[k] = sub_queries
+            elif k == "$comment":
+                stored_query[k] = v
+            elif k.startswith("$"):
+                return None
+            else:
+                stored_alias = self._get_stored_alias(model_info, k)
+                if stored_alias is None:
+                    return None
+                stored_query[stored_alias] = v
+
+        return stored_query
+
+    def _split_query(
+            self,
+            model_info: DocModelInfo,
+            query: MongoQuery,
+    ) -> tuple[MongoQuery, MongoQuery]:
+        """Splits query to conjuncts over stored fields (matched before joins) and conjuncts over joined ones."""
+        stored: list[MongoQuery] = []
+        joined: list[MongoQuery] = []
+
+        for conjunct in _get_conjuncts(query):
+            stored_conjunct = self._get_stored_query(model_info, conjunct)
+            if stored_conjunct is None:
+                joined.append(conjunct)
+            else:
+                stored.append(stored_conjunct)
+
+        return _make_conjunction(stored), _make_conjunction(joined)
+
+    def _get_stored_sort(
+            self,
+            model_info: DocModelInfo,
+            sort: MongoQuery,
+    ) -> MongoQuery | None:
+        """Rewrites sort to be applied to stored documents, None if sort requires join."""
+        stored_sort: MongoQuery = {}
+        for k, v in sort.items():
+            stored_alias = self._get_stored_alias(model_info, k)
+            if stored_alias is None:
+                return None
+            stored_sort[stored_alias] = v
+        return stored_sort
 
     def _get_find_pipeline(
             self,
@@ -333,37 +1484,90 @@ class Engine:
             sort: Query | None = None,
             skip: int | None = None,
             limit: int | None = None,
+            expansion: Expansion,
     ) -> list[MongoQuery]:
         pipline: list[MongoQuery] = []
 
-        assert model_info.full_pipeline is not None
-        pipline.extend(model_info.full_pipeline)
+        stored_query, joined_query = self._split_query(model_info, query)
+        sort_query = Q(sort) if sort is not None else None
+        stored_sort = self._get_stored_sort(model_info, sort_query) if sort_query is not None else None
+
+        # paginate before joins, so only returned documents are joined
+        is_paginated_before_joins = not joined_query and (sort_query is None or stored_sort is not None)
+
+        def paginate(sort_query: MongoQuery | None) -> None:
+            if sort_query is not None:
+                pipline.append({"$sort": sort_query})
+
+            if skip is not None:
+                pipline.append({"$skip": skip})
 
-        if query:
-            pipline.append({"$match": query})
+            if limit is not None:
+                pipline.append({"$limit": limit})
 
-        if sort is not None:
-            pipline.append({"$sort": Q(sort)})
+        if stored_query:
+            pipline.append({"$match": stored_query})
 
-        if skip is not None:
-            pipline.append({"$skip": skip})
+        if is_paginated_before_joins:
+            paginate(stored_sort)
 
-        if limit is not None:
-            pipline.append({"$limit": limit})
+        pipline.extend(expansion.pipeline)
+
+        if joined_query:
+            pipline.append({"$match": joined_query})
+
+        if not is_paginated_before_joins:
+            paginate(sort_query)
 
         return pipline
 
+    def _get_find_expansion(
+            self,
+            doc_model: DocModel,
+            query: Query | None,
+            sort: Query | None,
+            expand: Sequence[Any] | None,
+            server_expand: Sequence[Any] = (),
+    ) -> Expansion:
+        """Gets expansion for find operation, links are joined by default if expand is not given.
+
+        Links in server_expand fields (or alias paths) are joined on server, e.g. ones projected in pipeline.
+        """
+        model_info = self.doc_models_info[doc_model]
+
+        # links which fields are matched or sorted by after joins must be joined on server
+        _, joined_query = self._split_query(model_info, Q(query))
+        joined_sort = Q(sort) if sort is not None and self._get_stored_sort(model_info, Q(sort)) is None else None
+        server_paths = self._get_expand(
+            doc_model,
+            [*_get_query_keys(joined_query), *(joined_sort or {}), *server_expand],
+            False,
+        )
+
+        paths = self._get_expand(doc_model, expand or [], True) | server_paths
+        if expand is None:
+            assert model_info.default_expand is not None
+            paths |= model_info.default_expand
+
+        return self._get_expansion(doc_model, paths, server_paths)
+
     def _get_count_pipeline(
             self,
             model_info: DocModelInfo,
             query: MongoQuery,
+            *,
+            expansion: Expansion,
     ) -> list[MongoQuery]:
         pipline: list[MongoQuery] = []
 
-        if query:
-            assert model_info.full_pipeline is not None
-            pipline.extend(model_info.full_pipeline)
-            pipline.append({"$match": Q(query)})
+        stored_query, joined_query = self._split_query(model_info, query)
+
+        if stored_query:
+            pipline.append({"$match": stored_query})
+
+        if joined_query:
+            pipline.extend(expansion.pipeline)
+            pipline.append({"$match": joined_query})
 
         pipline.extend([
             {"$count": "count"},
@@ -379,47 +1583,208 @@ class Engine:
             sort: Query | None = None,
             skip: int | None = None,
             limit: int | None = None,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
     ) -> list[Doc]:
+        model_info = self.doc_models_info[doc_model]
+        expansion = self._get_find_expansion(doc_model, query, sort, expand)
         pipline = self._get_find_pipeline(
-            self.doc_models_info[doc_model],
+            model_info,
             Q(query),
             sort=sort,
             skip=skip,
             limit=limit,
+            expansion=expansion,
         )
+        generation = model_info.cache_generation
         res = await doc_model.__collection__.aggregate(pipline).to_list(None)
-        return parse_obj_as_compat(list[doc_model], res)  # type: ignore[valid-type]
+        res = await self._complete_docs(doc_model, expansion, res)
+        self._fill_cache(doc_model, expansion, res, generation)
+        return [
+            self._track_doc(doc_model, expansion, doc)
+            for doc in await self._validate_docs(doc_model, res, validate)
+        ]
 
-    async def _find_iter(
+    async def _find_raw(
             self,
             doc_model: DocModel,
             query: Query | None,
             *,
+            fields: Sequence[Any],
             sort: Query | None = None,
             skip: int | None = None,
             limit: int | None = None,
-    ) -> AsyncGenerator[Doc]:
-        pipline = self._get_find_pipeline(
-            self.doc_models_info[doc_model],
-            Q(query),
-            sort=sort,
+    ) -> list[MongoDoc]:
+        _validate(
+            len(fields) > 0,
+            f"Fields to find must be given for {doc_model.__name__}",
+        )
+        model_info = self.doc_models_info[doc_model]
+        aliases = [f._alias if isinstance(f, ButtyField) else f for f in fields]
+
+        # identity of plain link is projected from stored id, so link is not joined for it
+        stored_links: dict[FieldAlias, tuple[FieldName, FieldAlias]] = {}
+        joined_aliases: list[FieldAlias] = []
+        for alias in aliases:
+            head, _, rest = alias.partition(".")
+            for field_name, link in model_info.links.items():
+                if all([
+                    link.local_field.alias == head,
+                    link.link_type == "plain",
+                    rest == self.doc_models_info[link.link_to].identity.alias,
+                ]):
+                    stored_links[alias] = (field_name, head)
+                    break
+            else:
+                joined_aliases.append(alias)
+
+        expansion = self._get_find_expansion(doc_model, query, sort, [], joined_aliases)
+        project: MongoQuery = {} if "_id" in aliases else {"_id": 0}
+        for alias in aliases:
+            if alias in stored_links and stored_links[alias][0] not in expansion.expanded:
+                project[alias] = "$" + stored_links[alias][1]
+            else:
+                project[alias] = 1
+
+        pipline = self._get_find_pipeline(
+            model_info,
+            Q(query),
+            sort=sort,
             skip=skip,
             limit=limit,
+            expansion=expansion,
         )
-        async for d in doc_model.__collection__.aggregate(pipline):
-            yield parse_obj_as_compat(doc_model, d)
+        pipline.append({"$project": project})
+        return cast(list[MongoDoc], await doc_model.__collection__.aggregate(pipline).to_list(None))
+
+    async def _find_page(
+            self,
+            doc_model: DocModel,
+            query: Query | None,
+            *,
+            sort: Query | None,
+            after: str | None,
+            limit: int,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
+    ) -> tuple[list[Doc], str | None]:
+        _validate(
+            limit > 0,
+            f"Page limit must be positive, {limit} given",
+        )
+        model_info = self.doc_models_info[doc_model]
+
+        # identity makes sort keys unique
+        page_sort = Q(sort)
+        page_sort.setdefault(model_info.identity.alias, 1)
+        keys = [*page_sort.items()]
+        _validate(
+            all(direction in (1, -1) for _, direction in keys),
+            f"Page sort directions must be 1 or -1, {page_sort} given",
+        )
+
+        page_query = Q(query)
+        if after is not None:
+            keyset_query = _get_keyset_query(keys, _decode_page_token(after, keys))
+            page_query = _make_conjunction([*_get_conjuncts(page_query), keyset_query])
+
+        expansion = self._get_find_expansion(doc_model, page_query, page_sort, expand)
+        pipline = self._get_find_pipeline(
+            model_info,
+            page_query,
+            sort=page_sort,
+            limit=limit + 1,
+            expansion=expansion,
+        )
+        generation = model_info.cache_generation
+        res = await doc_model.__collection__.aggregate(pipline).to_list(None)
+
+        token = None
+        if len(res) > limit:
+            token = _encode_page_token(keys, [_get_path_value(res[limit - 1], alias) for alias, _ in keys])
+
+        res = await self._complete_docs(doc_model, expansion, res[:limit])
+        self._fill_cache(doc_model, expansion, res, generation)
+        docs = await self._validate_docs(doc_model, res, validate)
+        return [self._track_doc(doc_model, expansion, doc) for doc in docs], token
+
+    async def _find_iter(
+            self,
+            doc_model: DocModel,
+            query: Query | None,
+            *,
+            sort: Query | None = None,
+            skip: int | None = None,
+            limit: int | None = None,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
+            batch_size: int | None = None,
+            prefetch: int = 1,
+    ) -> AsyncGenerator[Doc]:
+        if batch_size is None:
+            batch_size = _FIND_ITER_BATCH_SIZE
+        _validate(
+            batch_size > 0,
+            f"Batch size must be positive, {batch_size} given",
+        )
+        _validate(
+            prefetch >= 0,
+            f"Number of prefetched batches must not be negative, {prefetch} given",
+        )
+        model_info = self.doc_models_info[doc_model]
+        expansion = self._get_find_expansion(doc_model, query, sort, expand)
+        pipline = self._get_find_pipeline(
+            model_info,
+            Q(query),
+            sort=sort,
+            skip=skip,
+            limit=limit,
+            expansion=expansion,
+        )
+
+        generation = model_info.cache_generation
+
+        # at most batch being consumed and prefetched batches are buffered, besides batch buffered by driver
+        batches = _read_batches(doc_model.__collection__.aggregate(pipline, batchSize=batch_size), batch_size)
+        if prefetch:
+            batches = _prefetch(batches, prefetch)
+
+        try:
+            async for batch in batches:
+                batch = await self._complete_docs(doc_model, expansion, batch)
+                self._fill_cache(doc_model, expansion, batch, generation)
+                for doc in await self._validate_docs(doc_model, batch, validate):
+                    yield self._track_doc(doc_model, expansion, doc)
+        finally:
+            await batches.aclose()
 
     async def _count_documents(
             self,
             doc_model: DocModel,
             query: Query | None,
+            estimated: bool,
     ) -> int:
+        if estimated:
+            _validate(
+                query is None,
+                f"Query must not be given for estimated count of {doc_model.__name__}",
+            )
+            return await doc_model.__collection__.estimated_document_count()
+
+        model_info = self.doc_models_info[doc_model]
+        stored_query, joined_query = self._split_query(model_info, Q(query))
+
+        if not joined_query:
+            return await doc_model.__collection__.count_documents(stored_query)
+
         pipline = self._get_count_pipeline(
-            self.doc_models_info[doc_model],
+            model_info,
             Q(query),
+            # only links required by query are joined
+            expansion=self._get_find_expansion(doc_model, query, None, []),
         )
         res = await doc_model.__collection__.aggregate(pipline).to_list(None)
-        return cast(int, res[0]["count"])
+        return cast(int, res[0]["count"]) if res else 0
 
     async def _find_and_count(
             self,
@@ -429,29 +1794,44 @@ class Engine:
             sort: Query | None,
             skip: int | None,
             limit: int | None,
+            expand: Sequence[Any] | None = None,
+            validate: bool | None = None,
     ) -> tuple[list[Doc], int]:
-        query = Q(query)
+        model_info = self.doc_models_info[doc_model]
+        expansion = self._get_find_expansion(doc_model, query, sort, expand)
+        stored_query, joined_query = self._split_query(model_info, Q(query))
         data_pipline = self._get_find_pipeline(
-            self.doc_models_info[doc_model],
-            query,
+            model_info,
+            joined_query,
             sort=sort,
             skip=skip,
             limit=limit,
+            expansion=expansion,
         )
         count_pipline = self._get_count_pipeline(
-            self.doc_models_info[doc_model],
-            query,
+            model_info,
+            joined_query,
+            expansion=self._get_find_expansion(doc_model, query, None, []),
         )
-        pipline = [
+        pipline: list[MongoQuery] = []
+        if stored_query:
+            # match before $facet to make use of indexes
+            pipline.append({"$match": stored_query})
+        pipline.append(
             {"$facet": {
                 "data": data_pipline,
                 "count": count_pipline,
             }},
-        ]
+        )
         res = await doc_model.__collection__.aggregate(pipline).to_list(None)
+        data = await self._validate_docs(
+            doc_model,
+            await self._complete_docs(doc_model, expansion, res[0]["data"]),
+            validate,
+        )
         return (
-            parse_obj_as_compat(list[doc_model], res[0]["data"]),  # type: ignore[valid-type]
-            res[0]["count"][0]["count"]
+            [self._track_doc(doc_model, expansion, doc) for doc in data],
+            res[0]["count"][0]["count"] if res[0]["count"] else 0,
         )
 
     async def _update_document(
@@ -473,13 +1853,66 @@ class Engine:
             return_document=ReturnDocument.AFTER,
             upsert=upsert,
         )
+        self._invalidate_cache(doc_model, [id_])
+        self._forget_docs(doc_model, [id_])
         if res is None:
             raise DocumentNotFound(doc_model, "update_document", query)
         return doc_model(**res)  # noqa
 
+    async def _update_many(
+            self,
+            doc_model: DocModel,
+            query: Query,
+            update: Query,
+    ) -> int:
+        info = self.doc_models_info[doc_model]
+        _validate(
+            info.version_field is None,
+            f"Update operations are not supported for versioned model {doc_model.__name__}",
+        )
+
+        stored_query, joined_query = self._split_query(info, Q(query))
+        ids = None
+        # within unit of work only updated documents are forgotten, others keep their pending changes
+        if joined_query or current_unit_of_work.get() is not None:
+            ids = await self._find_ids(doc_model, query, None)
+            stored_query = {info.identity.alias: {"$in": ids}}
+
+        result: UpdateResult = await doc_model.__collection__.update_many(stored_query, Q(update))
+
+        # updated documents are not known for stored query outside of unit of work
+        self._invalidate_cache(doc_model, ids)
+        self._forget_docs(doc_model, ids)
+        return result.modified_count
+
+    async def _find_ids(
+            self,
+            doc_model: DocModel,
+            query: Query,
+            session: Any,
+    ) -> list[Any]:
+        """Finds identities of documents matching query, only links referenced by query are joined."""
+        info = self.doc_models_info[doc_model]
+        identity_alias = info.identity.alias
+        stored_query, joined_query = self._split_query(info, Q(query))
+
+        if not joined_query:
+            return [
+                d[identity_alias]
+                async for d in doc_model.__collection__.find(stored_query, {identity_alias: 1}, session=session)
+            ]
+
+        pipeline = [
+            *self._get_find_pipeline(info, Q(query), expansion=self._get_find_expansion(doc_model, query, None, [])),
+            {"$project": {identity_alias: 1}},
+        ]
+        res = await doc_model.__collection__.aggregate(pipeline, session=session).to_list(None)
+        return [d[identity_alias] for d in res]
+
     async def _delete(
             self,
             doc: Doc,
+            transaction: bool,
     ) -> Doc:
         doc = await doc.before_delete()
 
@@ -492,48 +1925,155 @@ class Engine:
             f"Identity must be provided for {doc.__class__.__name__} to delete",
         )
 
-        for doc_model_from, link in self.cascade_delete_graph.get(doc_model, {}).items():
-            for cascade_doc in await doc_model_from.find(
-                    F(getattr(getattr(doc_model_from, link.local_field.name), info.identity.alias)) == identity
-            ):
-                await cascade_doc.delete()
-
-        for link in info.links.values():
-            if link.on_delete == "propagate":
-                linked_docs = cast(LinkedDocs | None, getattr(doc, link.local_field.name, None))
-
-                linked_doc: Doc
-                if linked_docs is not None:
-                    match link.link_type:
-                        case "plain":
-                            assert isinstance(linked_docs, Document)
-                            await linked_docs.delete()
-                        case "array":
-                            assert isinstance(linked_docs, list)
-                            for linked_doc in linked_docs:
-                                await linked_doc.delete()
-                        case "dict":
-                            assert isinstance(linked_docs, dict)
-                            for linked_doc in linked_docs.values():
-                                await linked_doc.delete()
-
-        query = {
-            info.identity.alias: identity,
-        }
+        if transaction:
+            async with await self.db.client.start_session() as session:
+                async with session.start_transaction():
+                    deleted_count = await self._delete_with_dependents(doc_model, [identity], session, False)
+        else:
+            deleted_count = await self._delete_with_dependents(doc_model, [identity], None, False)
 
-        result: DeleteResult = await doc_model.__collection__.delete_one(query)
-
-        if result.deleted_count < 1:
-            raise DocumentNotFound(doc_model, "delete", query)
+        if deleted_count < 1:
+            raise DocumentNotFound(doc_model, "delete", {info.identity.alias: identity})
 
         setattr(doc, info.identity.name, None)
         return doc
 
+    async def _delete_many(
+            self,
+            doc_model: DocModel,
+            query: Query,
+            transaction: bool,
+    ) -> int:
+        async def delete(session: Any) -> int:
+            ids = await self._find_ids(doc_model, query, session)
+            return await self._delete_with_dependents(doc_model, ids, session, True) if ids else 0
+
+        if transaction:
+            async with await self.db.client.start_session() as session:
+                async with session.start_transaction():
+                    return await delete(session)
+        return await delete(None)
+
+    async def _delete_with_dependents(
+            self,
+            doc_model: DocModel,
+            identities: list[Any],
+            session: Any,
+            root_hooks: bool,
+    ) -> int:
+        """Deletes documents along with dependent ones.
+
+        :param root_hooks: Call hooks of given documents, not only of dependent ones.
+        :return: Number of deleted documents of doc_model with given identities.
+        """
+        info = self.doc_models_info[doc_model]
+
+        levels = await self._get_delete_levels(doc_model, identities, session)
+
+        for level in levels[0 if root_hooks else 1:]:
+            for dependent_model, ids in level.items():
+                if _has_before_delete(dependent_model):
+                    dependent_info = self.doc_models_info[dependent_model]
+                    expansion = self._get_find_expansion(dependent_model, None, None, None)
+                    pipeline = self._get_find_pipeline(
+                        dependent_info,
+                        {dependent_info.identity.alias: {"$in": ids}},
+                        expansion=expansion,
+                    )
+                    res = await dependent_model.__collection__.aggregate(pipeline, session=session).to_list(None)
+                    res = await self._complete_docs(dependent_model, expansion, res, session)
+                    for dependent_doc in dependent_info.list_adapter.validate(res):
+                        await dependent_doc.before_delete()
+
+        # dependents are deleted first, so no document is left with broken link if deletion is interrupted
+        for level in reversed(levels[1:]):
+            for dependent_model, ids in level.items():
+                await dependent_model.__collection__.delete_many(
+                    {self.doc_models_info[dependent_model].identity.alias: {"$in": ids}},
+                    session=session,
+                )
+
+        result: DeleteResult = await doc_model.__collection__.delete_many(
+            {info.identity.alias: {"$in": identities}},
+            session=session,
+        )
+
+        for level in levels:
+            for deleted_model, ids in level.items():
+                self._invalidate_cache(deleted_model, ids)
+                self._forget_docs(deleted_model, ids)
+
+        return result.deleted_count
+
+    async def _get_delete_levels(
+            self,
+            doc_model: DocModel,
+            identities: list[Any],
+            session: Any,
+    ) -> list[dict[DocModel, list[Any]]]:
+        """Finds identities of documents to delete along with given ones, level by level.
+
+        Level contains documents linked with cascade delete to documents of previous level
+        and documents linked to documents of previous level with propagate delete.
+        """
+        levels: list[dict[DocModel, list[Any]]] = []
+        visited: dict[DocModel, set[Any]] = {doc_model: set(identities)}
+        level: dict[DocModel, list[Any]] = {doc_model: [*identities]}
+
+        while level:
+            levels.append(level)
+            next_level: dict[DocModel, list[Any]] = {}
+
+            def add(model: DocModel, id_: Any) -> None:
+                if id_ is not None and id_ not in visited.setdefault(model, set()):
+                    visited[model].add(id_)
+                    next_level.setdefault(model, []).append(id_)
+
+            for model, ids in level.items():
+                info = self.doc_models_info[model]
+
+                for model_from, link in self.cascade_delete_graph.get(model, {}).items():
+                    identity_alias = self.doc_models_info[model_from].identity.alias
+                    async for d in model_from.__collection__.find(
+                            {link.link_name: {"$in": ids}},
+                            {identity_alias: 1},
+                            session=session,
+                    ):
+                        add(model_from, d[identity_alias])
+
+                propagate_links = [link for link in info.links.values() if link.on_delete == "propagate"]
+                if not propagate_links:
+                    continue
+
+                async for d in model.__collection__.find(
+                        {info.identity.alias: {"$in": ids}},
+                        {link.link_name: 1 for link in propagate_links},
+                        session=session,
+                ):
+                    for link in propagate_links:
+                        linked_ids = d.get(link.link_name)
+                        if linked_ids is None:
+                            continue
+                        match link.link_type:
+                            case "plain":
+                                add(link.link_to, linked_ids)
+                            case "array":
+                                for linked_id in linked_ids:
+                                    add(link.link_to, linked_id)
+                            case "dict":
+                                for linked_id in linked_ids.values():
+                                    add(link.link_to, linked_id)
+
+            level = next_level
+
+        return levels
+
     # ----------------------------------------------------
 
     def _parse_doc_model(self, doc_model: DocModel) -> DocModelInfo:
         identity: ModelFieldInfo | None = None
         identity_provider: IdentityProvider | None = None
+        identity_batch_provider: IdentityBatchProvider | None = None
         links: dict[FieldName, Link] = {}
         back_links: dict[FieldName, BackLink] = {}
         indexes: list[pymongo.IndexModel] = []
@@ -556,6 +2096,8 @@ class Engine:
                 is_mongo_id = identity.alias == "_id"
                 identity_provider = extra.get(KnownExtra.identity_provider)
                 identity_provider_factory = extra.get(KnownExtra.identity_provider_factory)
+                identity_batch_provider = extra.get(KnownExtra.identity_batch_provider)
+                identity_batch_provider_factory = extra.get(KnownExtra.identity_batch_provider_factory)
                 if not is_mongo_id:
                     if identity_provider_factory is not None:
                         _validate(
@@ -564,12 +2106,21 @@ class Engine:
                             f" for {doc_model.__name__}.{f.name}",
                         )
                         identity_provider = identity_provider_factory(doc_model)
+                    if identity_batch_provider_factory is not None:
+                        _validate(
+                            identity_batch_provider is None,
+                            f"Identity batch provider and factory must not be set at once"
+                            f" for {doc_model.__name__}.{f.name}",
+                        )
+                        identity_batch_provider = identity_batch_provider_factory(doc_model)
                     indexes.append(pymongo.IndexModel(f.alias, unique=True))
                 else:
                     _validate(
                         all([
                             identity_provider is None,
                             identity_provider_factory is None,
+                            identity_batch_provider is None,
+                            identity_batch_provider_factory is None,
                         ]),
                         f"Nor identity provider nor factory can be set for native MongoDB _id"
                         f" for {doc_model.__name__}.{f.name}",
@@ -603,6 +2154,21 @@ class Engine:
 
                     on_delete = extra.get(KnownExtra.on_delete, "nothing")
 
+                    max_depth = extra.get(KnownExtra.max_depth)
+                    _validate(
+                        max_depth is None or max_depth >= 0,
+                        f"Link max depth must not be negative for {doc_model.__name__}.{f.name}",
+                    )
+
+                    # links to cached documents are served from cache
+                    join_strategy = extra.get(KnownExtra.join_strategy) or (
+                        "client" if _get_cache_config(link_to)[0] is not None else self.join_strategy
+                    )
+                    _validate(
+                        join_strategy in ("server", "client"),
+                        f"Unknown join strategy {join_strategy} for {doc_model.__name__}.{f.name}",
+                    )
+
                     _validate(
                         on_delete != "cascade" or link_type == "plain",
                         f"Link must be plain to support cascade delete for {doc_model.__name__}.{f.name}",
@@ -614,6 +2180,8 @@ class Engine:
                         link_name=link_name,
                         link_type=cast(LinkType, link_type),
                         on_delete=on_delete,
+                        max_depth=max_depth,
+                        join_strategy=join_strategy,
                     )
                     links[f.name] = link
 
@@ -638,9 +2206,16 @@ class Engine:
                         f"Backlink {f.name} must be defined as optional array with default for {doc_model.__name__}",
                     )
 
+                    back_link_max_depth = extra.get(KnownExtra.max_depth)
+                    _validate(
+                        back_link_max_depth is None or back_link_max_depth >= 0,
+                        f"Backlink max depth must not be negative for {doc_model.__name__}.{f.name}",
+                    )
+
                     back_links[f.name] = BackLink(
                         local_field=f,
                         link_from=cast(DocModel, f.annotation.core_type),
+                        max_depth=back_link_max_depth,
                     )
 
                 continue
@@ -660,196 +2235,898 @@ class Engine:
         )
         assert identity is not None
 
+        cache_max_size, cache_ttl = _get_cache_config(doc_model)
+        _validate(
+            cache_max_size is None or cache_max_size > 0,
+            f"Cache max size must be positive for {doc_model.__name__}",
+        )
+
+        stored_aliases = {
+            f.alias
+            for f in fields.values()
+            if f.name not in links
+            if f.name not in back_links
+        } | {
+            link.link_name
+            for link in links.values()
+        }
+
         return DocModelInfo(
             fields=fields,
             identity=identity,
             identity_provider=identity_provider,
+            identity_batch_provider=identity_batch_provider,
             links=links,
             back_links=back_links,
             indexes=indexes,
             version_field=version_field,
             version_provider=version_provider,
+            stored_aliases=stored_aliases,
+            adapter=TypeAdapterCompat(doc_model),
+            list_adapter=TypeAdapterCompat(list[doc_model]),  # type: ignore[valid-type]
+            validate_on_read=getattr(getattr(doc_model, "DocumentConfig", None), "validate_on_read", True),
+            track_changes=getattr(getattr(doc_model, "DocumentConfig", None), "track_changes", False),
+            cache=DocumentCache(cache_max_size, cache_ttl) if cache_max_size is not None else None,
         )
 
-    def _make_forward_pipline(self, doc_model: DocModel) -> None:
+    def _get_linked_models(self, doc_model: DocModel) -> set[DocModel]:
+        """Finds models reachable from doc_model by links and back links."""
+        linked_models: set[DocModel] = set()
+        models = [doc_model]
+        while models:
+            model_info = self.doc_models_info[models.pop()]
+            for linked_model in [
+                *(link.link_to for link in model_info.links.values()),
+                *(back_link.link_from for back_link in model_info.back_links.values()),
+            ]:
+                if linked_model not in linked_models:
+                    linked_models.add(linked_model)
+                    models.append(linked_model)
+        return linked_models
+
+    def _invalidate_cache(self, doc_model: DocModel, ids: list[Any] | None) -> None:
+        """Removes changed documents from caches, all documents of model if ids are unknown.
+
+        Caches of models sharing collection lose changed documents, caches of models linked to changed ones are cleared.
+        Generations of changed caches are bumped, so documents read before the change are not put to them.
+        """
+        for cached_model, model_info in self.doc_models_info.items():
+            if model_info.cache is None:
+                continue
+            if cached_model.__collection__.name == doc_model.__collection__.name:
+                model_info.cache_generation += 1
+                if ids is None:
+                    model_info.cache.clear()
+                else:
+                    model_info.cache.invalidate(ids)
+            if doc_model in model_info.cache_linked_models:
+                model_info.cache_generation += 1
+                model_info.cache.clear()
+
+    def _start_cache_watch(self) -> None:
+        """Starts watching collections of cached models and models they link to, if change source is given."""
+        if self.cache_change_source is None or self._cache_watch_tasks:
+            return
+
+        watched_collections: set[str] = set()
+        for doc_model, model_info in self.doc_models_info.items():
+            if model_info.cache is not None:
+                watched_collections |= {m.__collection__.name for m in [doc_model, *model_info.cache_linked_models]}
+
+        # models sharing collection are invalidated by the same stream
+        models_by_collection: dict[str, list[DocModel]] = {}
+        for doc_model in self.doc_models_info:
+            if doc_model.__collection__.name in watched_collections:
+                models_by_collection.setdefault(doc_model.__collection__.name, []).append(doc_model)
+
+        for doc_models in models_by_collection.values():
+            task = asyncio.ensure_future(self._watch_cache_changes(doc_models))
+            self._cache_watch_tasks.add(task)
+            task.add_done_callback(self._cache_watch_tasks.discard)
+
+    async def _watch_cache_changes(self, doc_models: list[DocModel]) -> None:
+        """Invalidates caches by change events of collection shared by doc_models, reopening stream on errors."""
+        assert self.cache_change_source is not None
+        collection = doc_models[0].__collection__
+        resume_token: Any = None
+        reopened = False
+
+        while True:
+            if reopened and resume_token is None:
+                # changes made while stream was closed are not seen
+                for doc_model in doc_models:
+                    self._invalidate_cache(doc_model, None)
+            reopened = True
+
+            try:
+                async for change in self.cache_change_source(collection, resume_token):
+                    for doc_model in doc_models:
+                        self._invalidate_cache(doc_model, self._get_changed_ids(doc_model, change))
+                    # stream can not be resumed after invalidate event
+                    resume_token = None if change["operationType"] == "invalidate" else change["_id"]
+            except OperationFailure as e:
+                # e.g. resume token is no longer in oplog
+                logger.warning("Change stream of %s failed, restarting: %s", collection.name, e)
+                resume_token = None
+            except Exception as e:
+                logger.warning("Change stream of %s interrupted, resuming: %s", collection.name, e)
+
+            await asyncio.sleep(_CACHE_WATCH_RETRY_DELAY)
+
+    def _get_changed_ids(self, doc_model: DocModel, change: MongoDoc) -> list[Any] | None:
+        """Identities of documents changed according to change event, None if all documents should be dropped."""
+        if change["operationType"] not in _CACHE_CHANGE_OPERATIONS:
+            return None
+
+        identity_alias = self.doc_models_info[doc_model].identity.alias
+        if identity_alias in (document_key := change.get("documentKey") or {}):
+            return [document_key[identity_alias]]
+        for document_field in ("fullDocument", "fullDocumentBeforeChange"):
+            if identity_alias in (document := change.get(document_field) or {}):
+                return [document[identity_alias]]
+        return None
+
+    def _make_default_expansion(self, doc_model: DocModel) -> None:
+        """Makes paths of links joined by default and expansion joining them.
+
+        Depth of joins is limited by engine and link max depth. Links to the same model are joined recursively with
+        $graphLookup, links closing cycle between models are not joined.
+        """
+
+        def get_paths(
+                doc_model: DocModel,
+                depth: int | None,
+                with_back_links: bool,
+                forward_chain: set[DocModel],
+                back_chain: set[DocModel],
+        ) -> set[FieldAlias]:
+            _validate(
+                doc_model in self.doc_models_info,
+                f"Document {doc_model.__name__} is not bound",
+            )
+            model_info = self.doc_models_info[doc_model]
+            paths: set[FieldAlias] = set()
+
+            for link in model_info.links.values():
+                _validate(
+                    link.link_to in self.doc_models_info,
+                    f"Link Document {link.link_to.__name__} is not bound",
+                )
+                link_depth = min((d for d in (depth, link.max_depth) if d is not None), default=None)
+                if link_depth == 0 or link.link_to is not doc_model and link.link_to in forward_chain:
+                    continue
+                paths.add(link.local_field.alias)
+                if link.link_to is not doc_model:
+                    paths.update(
+                        link.local_field.alias + "." + path
+                        for path in get_paths(
+                            link.link_to,
+                            link_depth - 1 if link_depth is not None else None,
+                            False,
+                            forward_chain | {link.link_to},
+                            back_chain,
+                        )
+                    )
+
+            for field_name, back_link in model_info.back_links.items():
+                _validate(
+                    back_link.link_from in self.doc_models_info,
+                    f"Backlink document {back_link.link_from.__name__} is not bound",
+                )
+                self._get_back_link_reference(doc_model, field_name, back_link)
+                if not with_back_links:
+                    continue
+                back_link_depth = min((d for d in (depth, back_link.max_depth) if d is not None), default=None)
+                if back_link_depth == 0 or back_link.link_from is not doc_model and back_link.link_from in back_chain:
+                    continue
+                paths.add(back_link.local_field.alias)
+                if back_link.link_from is not doc_model:
+                    paths.update(
+                        back_link.local_field.alias + "." + path
+                        for path in get_paths(
+                            back_link.link_from,
+                            back_link_depth - 1 if back_link_depth is not None else None,
+                            True,
+                            {back_link.link_from},
+                            back_chain | {back_link.link_from},
+                        )
+                    )
+
+            return paths
+
+        model_info = self.doc_models_info[doc_model]
+        model_info.default_expand = frozenset(get_paths(doc_model, self.max_depth, True, {doc_model}, {doc_model}))
+        model_info.default_expansion = self._get_expansion(doc_model, model_info.default_expand, frozenset())
+
+    def _get_link_stages(
+            self,
+            link: Link,
+            pipeline: list[MongoQuery],
+    ) -> list[MongoQuery]:
+        """Builds stages joining documents by forward link, pipeline is applied to linked documents."""
+        link_info = self.doc_models_info[link.link_to]
+
+        stages: list[MongoQuery] = []
+
+        match link.link_type:
+            case "plain":
+                lookup: dict[str, Any] = {
+                    "from": link.link_to.__collection__.name,
+                    "localField": link.link_name,
+                    "foreignField": link_info.identity.alias,
+                    "as": link.local_field.alias,
+                }
+                if pipeline:
+                    lookup["pipeline"] = pipeline
+
+                stages.extend([
+                    {"$lookup": lookup},
+                    {"$set": {link.local_field.alias: {"$first": "$" + link.local_field.alias}}},
+                ])
+
+            case "array":
+                # linked documents are looked up at once and then placed in order of stored ids,
+                # temporary field is removed by final $project
+                linked_alias = "__" + link.local_field.alias
+
+                lookup = {
+                    "from": link.link_to.__collection__.name,
+                    "localField": link.link_name,
+                    "foreignField": link_info.identity.alias,
+                    "as": linked_alias,
+                }
+                if pipeline:
+                    lookup["pipeline"] = pipeline
+
+                stages.extend([
+                    {"$lookup": lookup},
+                    {"$set": {
+                        link.local_field.alias: {"$filter": {
+                            "input": {"$map": {
+                                "input": "$" + link.link_name,
+                                "as": "linked_id",
+                                "in": {"$first": {"$filter": {
+                                    "input": "$" + linked_alias,
+                                    "cond": {"$eq": ["$$this." + link_info.identity.alias, "$$linked_id"]},
+                                }}},
+                            }},
+                            "cond": {"$ne": ["$$this", None]},
+                        }},
+                    }},
+                ])
+
+            case "dict":
+                # linked documents are looked up at once for all values of stored mapping
+                # and then placed back by keys, temporary field is removed by final $project
+                linked_alias = "__" + link.local_field.alias
+
+                lookup = {
+                    "from": link.link_to.__collection__.name,
+                    "localField": linked_alias,
+                    "foreignField": link_info.identity.alias,
+                    "as": linked_alias,
+                }
+                if pipeline:
+                    lookup["pipeline"] = pipeline
+
+                stages.extend([
+                    {"$set": {
+                        linked_alias: {"$map": {
+                            "input": {"$objectToArray": "$" + link.link_name},
+                            "in": "$$this.v",
+                        }},
+                    }},
+                    {"$lookup": lookup},
+                    {"$set": {
+                        link.local_field.alias: {"$arrayToObject": {"$filter": {
+                            "input": {"$map": {
+                                "input": {"$objectToArray": "$" + link.link_name},
+                                "as": "item",
+                                "in": {
+                                    "k": "$$item.k",
+                                    "v": {"$first": {"$filter": {
+                                        "input": "$" + linked_alias,
+                                        "cond": {"$eq": ["$$this." + link_info.identity.alias, "$$item.v"]},
+                                    }}},
+                                },
+                            }},
+                            "cond": {"$ne": [{"$type": "$$this.v"}, "missing"]},
+                        }}},
+                    }},
+                ])
+
+        return stages
+
+    def _get_back_link_stages(
+            self,
+            doc_model: DocModel,
+            field_name: FieldName,
+            back_link: BackLink,
+            pipeline: list[MongoQuery],
+    ) -> list[MongoQuery]:
+        """Builds stages joining documents by back link, pipeline is applied to joined documents."""
+        model_info = self.doc_models_info[doc_model]
+
+        lookup: dict[str, Any] = {
+            "from": back_link.link_from.__collection__.name,
+            "localField": model_info.identity.alias,
+            "foreignField": self._get_back_link_reference(doc_model, field_name, back_link).link_name,
+            "as": back_link.local_field.alias,
+        }
+        if pipeline:
+            lookup["pipeline"] = pipeline
+
+        return [
+            {"$lookup": lookup},
+        ]
+
+    def _get_back_link_reference(
+            self,
+            doc_model: DocModel,
+            field_name: FieldName,
+            back_link: BackLink,
+    ) -> Link:
+        """Finds single plain link from backlinked model to doc_model."""
+        references = [
+            link
+            for link in self.doc_models_info[back_link.link_from].links.values()
+            if link.link_to is doc_model and link.link_type == "plain"
+        ]
         _validate(
-            doc_model in self.doc_models_info,
-            f"Document {doc_model.__name__} is not bound",
+            len(references) == 1,
+            f"Can not construct backlink for {doc_model.__name__}.{field_name}"
+            f" (only single link from {back_link.link_from.__name__} allowed, "
+            f"{len(references)} found)",
         )
+        return references[0]
 
+    def _get_graph_node(
+            self,
+            doc_model: DocModel,
+            node: str,
+            recursive_alias: FieldAlias,
+            recursive_value: Any,
+    ) -> MongoQuery:
+        """Builds expression of document loaded by $graphLookup in form returned by joins.
+
+        Links are left as stored ids, field with recursive_alias is set to recursive_value.
+        """
         model_info = self.doc_models_info[doc_model]
+        expr: MongoQuery = {}
+        for f in model_info.fields.values():
+            if f.name in model_info.back_links:
+                continue
+            link = model_info.links.get(f.name)
+            expr[f.alias] = "$$" + node + "." + (link.link_name if link is not None else f.alias)
+        expr[recursive_alias] = recursive_value
+        return expr
+
+    def _get_graph_link_stages(
+            self,
+            link: Link,
+    ) -> list[MongoQuery]:
+        """Builds stages joining chain of documents by plain link to the same model with $graphLookup.
+
+        Linked documents are nested as in regular joins, last loaded document keeps stored id of its link.
+        """
+        doc_model = link.link_to
+        link_info = self.doc_models_info[doc_model]
+        alias = link.local_field.alias
+        linked_alias = "__" + alias
+
+        graph_lookup: dict[str, Any] = {
+            "from": doc_model.__collection__.name,
+            "startWith": "$" + link.link_name,
+            "connectFromField": link.link_name,
+            "connectToField": link_info.identity.alias,
+            "as": linked_alias,
+            "depthField": "__depth",
+        }
+        max_depth = link.max_depth if link.max_depth is not None else self.max_depth
+        if max_depth is not None:
+            graph_lookup["maxDepth"] = max_depth - 1
+
+        # chain is folded from the farthest document, temporary field is removed by final $project
+        return [
+            {"$graphLookup": graph_lookup},
+            {"$set": {
+                alias: {"$reduce": {
+                    "input": {"$reverseArray": {"$range": [0, {"$size": "$" + linked_alias}]}},
+                    "initialValue": None,
+                    "in": {"$let": {
+                        "vars": {"node": {"$first": {"$filter": {
+                            "input": "$" + linked_alias,
+                            "as": "linked",
+                            "cond": {"$eq": ["$$linked.__depth", "$$this"]},
+                        }}}},
+                        "in": self._get_graph_node(
+                            doc_model,
+                            "node",
+                            alias,
+                            {"$ifNull": ["$$value", "$$node." + link.link_name]},
+                        ),
+                    }},
+                }},
+            }},
+        ]
 
-        pipeline = []
+    def _get_graph_back_link_stages(
+            self,
+            doc_model: DocModel,
+            field_name: FieldName,
+            back_link: BackLink,
+    ) -> list[MongoQuery]:
+        """Builds stages joining tree of documents by back link from the same model with $graphLookup.
+
+        Backlinked documents are nested as in regular joins, their links to parent are left as stored ids.
+        """
+        model_info = self.doc_models_info[doc_model]
+        reference = self._get_back_link_reference(doc_model, field_name, back_link)
+        alias = back_link.local_field.alias
+        linked_alias = "__" + alias
+
+        graph_lookup: dict[str, Any] = {
+            "from": doc_model.__collection__.name,
+            "startWith": "$" + model_info.identity.alias,
+            "connectFromField": model_info.identity.alias,
+            "connectToField": reference.link_name,
+            "as": linked_alias,
+            "depthField": "__depth",
+        }
+        max_depth = back_link.max_depth if back_link.max_depth is not None else self.max_depth
+        if max_depth is not None:
+            graph_lookup["maxDepth"] = max_depth - 1
+
+        # tree is folded level by level from the deepest one, temporary field is removed by $unset
+        return [
+            {"$graphLookup": graph_lookup},
+            {"$set": {
+                alias: {"$reduce": {
+                    "input": {"$reverseArray": {"$range": [
+                        0,
+                        {"$add": [{"$ifNull": [{"$max": "$" + linked_alias + ".__depth"}, -1]}, 1]},
+                    ]}},
+                    "initialValue": [],
+                    "in": {"$map": {
+                        "input": {"$filter": {
+                            "input": "$" + linked_alias,
+                            "as": "linked",
+                            "cond": {"$eq": ["$$linked.__depth", "$$this"]},
+                        }},
+                        "as": "node",
+                        "in": self._get_graph_node(
+                            doc_model,
+                            "node",
+                            alias,
+                            {"$filter": {
+                                "input": "$$value",
+                                "as": "child",
+                                "cond": {"$eq": [
+                                    "$$child." + reference.local_field.alias,
+                                    "$$node." + model_info.identity.alias,
+                                ]},
+                            }},
+                        ),
+                    }},
+                }},
+            }},
+            {"$unset": linked_alias},
+        ]
 
+    def _get_link_model(
+            self,
+            doc_model: DocModel,
+            alias: FieldAlias,
+    ) -> DocModel | None:
+        """Gets model linked by link or back link with given alias, None if field is not a link."""
+        model_info = self.doc_models_info[doc_model]
         for link in model_info.links.values():
+            if link.local_field.alias == alias:
+                return link.link_to
+        for back_link in model_info.back_links.values():
+            if back_link.local_field.alias == alias:
+                return back_link.link_from
+        return None
+
+    def _get_expand(
+            self,
+            doc_model: DocModel,
+            expand: Sequence[Any],
+            strict: bool,
+    ) -> frozenset[FieldAlias]:
+        """Builds alias paths of links to expand from fields or alias paths.
+
+        If not strict, paths are cut to links (e.g. query keys), otherwise paths must consist of links.
+        """
+        def get_link_path(path: FieldAlias) -> list[FieldAlias]:
+            """Longest prefix of path which consists of links."""
+            linked_model: DocModel | None = doc_model
+            link_path = []
+            for part in path.split("."):
+                if linked_model is None or (linked_model := self._get_link_model(linked_model, part)) is None:
+                    break
+                link_path.append(part)
+            return link_path
+
+        paths: set[FieldAlias] = set()
+
+        for path in expand:
+            path = path._alias if isinstance(path, ButtyField) else path
+            link_path = get_link_path(path)
             _validate(
-                link.link_to in self.doc_models_info,
-                f"Link Document {link.link_to.__name__} is not bound",
+                not strict or len(link_path) == len(path.split(".")),
+                f"Can not expand {doc_model.__name__}.{path} (not a link)",
             )
-            link_info = self.doc_models_info[link.link_to]
+            if link_path:
+                paths.add(".".join(link_path))
 
-            if link_info.forward_pipeline is None:
-                self._make_forward_pipline(link.link_to)
-
-            other_aliases = \
-                {
-                    f.alias
-                    for f in model_info.fields.values()
-                    if f.name != link.local_field.name
-                    if f.alias != "_id"
-                } | {
-                    l.link_name
-                    for l in model_info.links.values()
-                    if l != link
-                }
+        return frozenset(paths)
 
-            match link.link_type:
-                case "plain":
-                    lookup: dict[str, Any] = {
-                        "from": link.link_to.__collection__.name,
-                        "localField": link.link_name,
-                        "foreignField": link_info.identity.alias,
-                        "as": link.local_field.alias,
-                    }
-                    if link_info.forward_pipeline:
-                        lookup["pipeline"] = link_info.forward_pipeline
-
-                    pipeline.extend([
-                        {"$lookup": lookup},
-                        {"$set": {link.local_field.alias: {"$first": "$" + link.local_field.alias}}},
-                    ])
+    def _get_expansion(
+            self,
+            doc_model: DocModel,
+            expand: frozenset[FieldAlias],
+            server_expand: frozenset[FieldAlias],
+    ) -> Expansion:
+        """Builds (or gets cached) pipeline joining links and back links by given alias paths.
+
+        Links which are not expanded are returned as stubs with identity only,
+        back links which are not expanded are not returned. Path parts which are not links are ignored.
+        Links with client join strategy are joined after read, unless they are in server_expand paths.
+        """
+        model_info = self.doc_models_info[doc_model]
+        if (expansion := model_info.expansions.get((expand, server_expand))) is not None:
+            return expansion
 
-                case "array":
-                    pipeline.extend([
-                        {"$unwind": {
-                            "path": "$" + link.link_name,
-                            "preserveNullAndEmptyArrays": True,
-                        }}
-                    ])
+        def get_sub_expand(alias: FieldAlias, expand: frozenset[FieldAlias]) -> frozenset[FieldAlias] | None:
+            """Paths to expand in linked documents, None if link itself is not expanded."""
+            if alias not in expand and not any(path.startswith(alias + ".") for path in expand):
+                return None
+            return frozenset(path[len(alias) + 1:] for path in expand if path.startswith(alias + "."))
 
-                    lookup = {
-                        "from": link.link_to.__collection__.name,
-                        "localField": link.link_name,
-                        "foreignField": link_info.identity.alias,
-                        "as": link.link_name,
-                    }
-                    if link_info.forward_pipeline:
-                        lookup["pipeline"] = link_info.forward_pipeline
-
-                    pipeline.extend([
-                        {"$lookup": lookup},
-                        {"$set": {
-                            link.link_name: {"$first": "$" + link.link_name},
-                        }},
-                        {"$group": {
-                                       "_id": "$_id",
-                                       link.local_field.alias: {"$push": "$" + link.link_name},
-                                   } | {
-                                       a: {"$first": "$" + a}
-                                       for a in other_aliases
-                                   }},
-                    ])
+        def validate_graph_expand(alias: FieldAlias, sub_expand: frozenset[FieldAlias]) -> None:
+            """Checks that paths in documents joined by $graphLookup go only by recursive field.
 
-                case "dict":
-                    pipeline.extend([
-                        {"$set": {
-                            link.link_name: {"$objectToArray": "$" + link.link_name},
-                        }},
-                        {"$unwind": {
-                            "path": "$" + link.link_name,
-                            "preserveNullAndEmptyArrays": True,
-                        }},
-                    ])
+            Other links of such documents are stored ids, so paths past them can not be matched, sorted or expanded.
+            """
+            for path in sub_expand:
+                _validate(
+                    all(part == alias for part in path.split(".")),
+                    f"Can not join {doc_model.__name__}.{alias}.{path} ({alias} is joined recursively)",
+                )
 
-                    lookup = {
-                        "from": link.link_to.__collection__.name,
-                        "localField": link.link_name + ".v",
-                        "foreignField": link_info.identity.alias,
-                        "as": link.link_name + ".v",
-                    }
-                    if link_info.forward_pipeline:
-                        lookup["pipeline"] = link_info.forward_pipeline
-
-                    pipeline.extend([
-                        {"$lookup": lookup},
-                        {"$set": {
-                            link.link_name + ".v": {"$first": "$" + link.link_name + ".v"},
-                        }},
-                        {"$group": {
-                                       "_id": "$_id",
-                                       link.local_field.alias: {"$push": "$" + link.link_name},
-                                   } | {
-                                       a: {"$first": "$" + a}
-                                       for a in other_aliases
-                                   }},
-                        {"$set": {
-                            link.local_field.alias: {
-                                "$arrayToObject": {
-                                    "$filter": {
-                                        "input": "$" + link.local_field.alias,
-                                        "cond": {"$ne": ["$this", {}]},
-                                    },
-                                },
-                            },
-                        }}]
-                    )
+        pipeline: list[MongoQuery] = []
+        expanded: dict[FieldName, Expansion] = {}
+        client_joined: dict[FieldName, Expansion] = {}
+        has_stubs = False
+
+        for field_name, link in model_info.links.items():
+            sub_expand = get_sub_expand(link.local_field.alias, expand)
+            sub_server_expand = get_sub_expand(link.local_field.alias, server_expand)
+            if sub_expand is None:
+                # stored ids, replaced with stubs after read
+                if link.link_name != link.local_field.alias:
+                    pipeline.append({"$set": {link.local_field.alias: "$" + link.link_name}})
+                has_stubs = True
+            elif link.link_to is doc_model and link.link_type == "plain":
+                validate_graph_expand(link.local_field.alias, sub_expand)
+                expanded[field_name] = _get_graph_expansion(field_name)
+                pipeline.extend(self._get_graph_link_stages(link))
+            elif link.join_strategy == "client" and sub_server_expand is None:
+                # stored ids, replaced with linked documents after read
+                client_joined[field_name] = self._get_expansion(link.link_to, sub_expand, frozenset())
+                if link.link_name != link.local_field.alias:
+                    pipeline.append({"$set": {link.local_field.alias: "$" + link.link_name}})
+            else:
+                expanded[field_name] = self._get_expansion(link.link_to, sub_expand, sub_server_expand or frozenset())
+                pipeline.extend(self._get_link_stages(link, expanded[field_name].pipeline))
 
         project = {f.alias: 1 for f in model_info.fields.values() if f.name not in model_info.back_links}
-        pipeline.extend([
-            {"$project": project},
-        ])
+        pipeline.append({"$project": project})
 
-        self.doc_models_info[doc_model].forward_pipeline = pipeline
+        for field_name, back_link in model_info.back_links.items():
+            sub_expand = get_sub_expand(back_link.local_field.alias, expand)
+            if sub_expand is None:
+                continue
+            if back_link.link_from is doc_model:
+                validate_graph_expand(back_link.local_field.alias, sub_expand)
+                expanded[field_name] = _get_graph_expansion(field_name)
+                pipeline.extend(self._get_graph_back_link_stages(doc_model, field_name, back_link))
+            else:
+                expanded[field_name] = self._get_expansion(
+                    back_link.link_from,
+                    sub_expand,
+                    get_sub_expand(back_link.local_field.alias, server_expand) or frozenset(),
+                )
+                pipeline.extend(
+                    self._get_back_link_stages(doc_model, field_name, back_link, expanded[field_name].pipeline),
+                )
 
-    def _make_full_pipline(self, doc_model: DocModel) -> None:
-        _validate(
-            doc_model in self.doc_models_info,
-            f"Document {doc_model.__name__} is not bound",
+        sub_expansions = [*expanded.values(), *client_joined.values()]
+        expansion = Expansion(
+            key=(expand, server_expand),
+            pipeline=pipeline,
+            expanded=expanded,
+            client_joined=client_joined,
+            has_stubs=has_stubs or any(e.has_stubs for e in sub_expansions),
+            has_client_joins=bool(client_joined) or any(e.has_client_joins for e in expanded.values()),
         )
+        model_info.expansions[(expand, server_expand)] = expansion
+        return expansion
 
+    def _validate_doc(self, doc_model: DocModel, mongo_doc: MongoDoc) -> Doc:
         model_info = self.doc_models_info[doc_model]
+        if not model_info.validate_on_read:
+            return cast(Doc, self._get_model_constructor(doc_model)(mongo_doc))
+        return model_info.adapter.validate(mongo_doc)
 
-        back_pipeline: list[MongoQuery] = []
+    async def _validate_docs(
+            self,
+            doc_model: DocModel,
+            mongo_docs: list[MongoDoc],
+            validate: bool | None = None,
+    ) -> list[Doc]:
+        """Validates read documents, large results are validated by chunks in validation executor."""
+        model_info = self.doc_models_info[doc_model]
+        if not (model_info.validate_on_read if validate is None else validate):
+            construct = self._get_model_constructor(doc_model)
+            return [cast(Doc, construct(mongo_doc)) for mongo_doc in mongo_docs]
+
+        list_adapter = model_info.list_adapter
+        size = self.validation_chunk_size
+        if self.validation_executor is None or len(mongo_docs) <= size:
+            return list_adapter.validate(mongo_docs)
+
+        loop = asyncio.get_running_loop()
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(self.validation_executor, list_adapter.validate, mongo_docs[i:i + size])
+            for i in range(0, len(mongo_docs), size)
+        ))
+        return [doc for chunk in chunks for doc in chunk]
+
+    def _get_constructor(self, t: Any) -> Callable[[Any], Any] | None:
+        """Makes function building value of given type from trusted stored data without validation, None if stored
+        value is used as is.
+
+        Models, including linked documents, are constructed recursively with fields mapped by aliases, enums are
+        built from stored values. Values of unions of several types are validated, as their type is not known w/o
+        validation, unless all members are used as stored.
+        """
+        origin = typing.get_origin(t)
+        args = typing.get_args(t)
+
+        if origin is Annotated:
+            # annotation can hold discriminator of union, so union is validated with it
+            if len(_get_union_members(args[0])) > 1:
+                return self._get_union_constructor(args[0], t)
+            return self._get_constructor(args[0])
+
+        if origin is Union or origin is UnionType:
+            members = _get_union_members(t)
+            if len(members) > 1:
+                return self._get_union_constructor(t, t)
+            return self._get_constructor(members[0])
+
+        if origin in (list, tuple, set, frozenset, dict):
+            if origin is tuple and args and (len(args) != 2 or args[1] is not Ellipsis):
+                constructors = [self._get_constructor(a) for a in args]
+                return lambda v: tuple(x if c is None or x is None else c(x) for c, x in zip(constructors, v))
+
+            item_constructor = self._get_constructor(args[-1]) if args else None
+            if item_constructor is None:
+                return None if origin in (list, dict) else origin
+            if origin is dict:
+                return lambda v: {k: x if x is None else item_constructor(x) for k, x in v.items()}
+            return lambda v: origin(x if x is None else item_constructor(x) for x in v)
+
+        if isinstance(t, type) and issubclass(t, BaseModel):
+            return self._get_model_constructor(t)
+
+        if isinstance(t, type) and issubclass(t, Enum):
+            return t
+
+        return None
+
+    def _get_union_constructor(self, union: Any, t: Any) -> Callable[[Any], Any] | None:
+        """Makes validator of values of union of several types given by annotation t, None if all union members are
+        used as stored."""
+        if all(self._get_constructor(a) is None for a in _get_union_members(union)):
+            return None
+        return TypeAdapterCompat(t).validate
+
+    def _get_model_constructor(self, model: Type[BaseModel]) -> Callable[[Any], Any]:
+        if (constructor := self._model_constructors.get(model)) is not None:
+            return constructor
+
+        model_info = self.doc_models_info.get(cast(DocModel, model))
+        fields_info = model_info.fields if model_info is not None else get_fields_info(model)
+        construct_model = get_constructor_compat(model)
+        fields: list[tuple[FieldAlias, FieldName, Callable[[Any], Any] | None]] = []
+
+        def construct(value: Any) -> Any:
+            # links which are not expanded are already replaced with stubs
+            if not isinstance(value, dict):
+                return value
+            return construct_model({
+                name: v if field_constructor is None or v is None else field_constructor(v)
+                for alias, name, field_constructor in fields
+                if (v := value.get(alias, _MISSING)) is not _MISSING
+            })
+
+        # registered before fields are resolved, so recursive models refer to it
+        self._model_constructors[model] = construct
+        fields.extend(
+            (f.alias, f.name, self._get_constructor(f.annotation.annotation_raw))
+            for f in fields_info.values()
+        )
+        return construct
 
-        assert model_info.forward_pipeline is not None
-        back_pipeline.extend(model_info.forward_pipeline)
+    async def _complete_docs(
+            self,
+            doc_model: DocModel,
+            expansion: Expansion,
+            mongo_docs: list[MongoDoc],
+            session: Any = None,
+    ) -> list[MongoDoc]:
+        """Joins links with client join strategy and replaces ids of links which are not expanded with stubs."""
+        if not expansion.has_stubs and not expansion.has_client_joins:
+            return mongo_docs
+
+        # ids to load by expansion of linked documents, there can be several expansions of the same model
+        linked_ids: dict[int, tuple[DocModel, Expansion, dict[Any, None]]] = {}
+        if expansion.has_client_joins:
+            for mongo_doc in mongo_docs:
+                self._collect_client_joined_ids(doc_model, expansion, mongo_doc, linked_ids)
+
+        linked_docs: dict[int, dict[Any, MongoDoc]] = {}
+        for key, (linked_model, linked_expansion, ids) in linked_ids.items():
+            linked_docs[key] = await self._load_client_joined(linked_model, linked_expansion, [*ids], session)
+
+        return [self._assemble_doc(doc_model, expansion, mongo_doc, linked_docs) for mongo_doc in mongo_docs]
+
+    def _collect_client_joined_ids(
+            self,
+            doc_model: DocModel,
+            expansion: Expansion,
+            mongo_doc: MongoDoc,
+            linked_ids: dict[int, tuple[DocModel, Expansion, dict[Any, None]]],
+    ) -> None:
+        model_info = self.doc_models_info[doc_model]
 
-        for field_name, back_link in model_info.back_links.items():
-            _validate(
-                back_link.link_from in self.doc_models_info,
-                f"Backlink document {back_link.link_from.__name__} is not bound",
-            )
-            back_link_info = self.doc_models_info[back_link.link_from]
+        for field_name, link in model_info.links.items():
+            value = mongo_doc.get(link.local_field.alias)
+            if value is None:
+                continue
+
+            values = [value] if link.link_type == "plain" else [*value.values()] if link.link_type == "dict" else value
 
-            if back_link_info.full_pipeline is None:
-                self._make_full_pipline(back_link.link_from)
+            if (client_expansion := expansion.client_joined.get(field_name)) is not None:
+                _, _, ids = linked_ids.setdefault(id(client_expansion), (link.link_to, client_expansion, {}))
+                ids.update(dict.fromkeys(values))
+            elif (link_expansion := expansion.expanded.get(field_name)) is not None and link_expansion.has_client_joins:
+                for v in values:
+                    if isinstance(v, dict):
+                        self._collect_client_joined_ids(link.link_to, link_expansion, v, linked_ids)
 
-            # find single reference from foreign model to doc_model
-            references = [
-                link.link_name
-                for link in back_link_info.links.values()
-                if link.link_to is doc_model and link.link_type == "plain"
+        for field_name, back_link in model_info.back_links.items():
+            value = mongo_doc.get(back_link.local_field.alias)
+            back_link_expansion = expansion.expanded.get(field_name)
+            if value is not None and back_link_expansion is not None and back_link_expansion.has_client_joins:
+                for v in value:
+                    self._collect_client_joined_ids(back_link.link_from, back_link_expansion, v, linked_ids)
+
+    async def _load_client_joined(
+            self,
+            doc_model: DocModel,
+            expansion: Expansion,
+            ids: list[Any],
+            session: Any,
+    ) -> dict[Any, MongoDoc]:
+        """Loads linked documents by ids with $in request per batch of ids, cached documents are not requested."""
+        model_info = self.doc_models_info[doc_model]
+        identity_alias = model_info.identity.alias
+
+        # reads within session are not cached as they can see uncommitted changes
+        cache = model_info.cache if session is None else None
+
+        cached: dict[Any, MongoDoc] = {}
+        if cache is not None:
+            for id_ in ids:
+                if (mongo_doc := cache.get(expansion.key, id_)) is not None:
+                    cached[id_] = mongo_doc
+            ids = [id_ for id_ in ids if id_ not in cached]
+
+        generation = model_info.cache_generation
+        mongo_docs: list[MongoDoc] = []
+        for i in range(0, len(ids), _CLIENT_JOIN_BATCH_SIZE):
+            pipeline = [
+                {"$match": {identity_alias: {"$in": ids[i:i + _CLIENT_JOIN_BATCH_SIZE]}}},
+                *expansion.pipeline,
             ]
-            _validate(
-                len(references) == 1,
-                f"Can not construct backlink for {doc_model.__name__}.{field_name}"
-                f" (only single link from {back_link.link_from.__name__} allowed, "
-                f"{len(references)} found)",
-            )
-            lookup: dict[str, Any] = {
-                "from": back_link.link_from.__collection__.name,
-                "localField": model_info.identity.alias,
-                "foreignField": references[0],
-                "as": back_link.local_field.alias,
-            }
-            if back_link_info.full_pipeline:
-                lookup["pipeline"] = back_link_info.full_pipeline
+            mongo_docs.extend(await doc_model.__collection__.aggregate(pipeline, session=session).to_list(None))
+
+        mongo_docs = await self._complete_docs(doc_model, expansion, mongo_docs, session)
+        if cache is not None:
+            self._fill_cache(doc_model, expansion, mongo_docs, generation)
+
+        return cached | {mongo_doc[identity_alias]: mongo_doc for mongo_doc in mongo_docs}
+
+    def _fill_cache(
+            self,
+            doc_model: DocModel,
+            expansion: Expansion,
+            mongo_docs: list[MongoDoc],
+            generation: int,
+    ) -> None:
+        """Puts loaded documents to cache of document model, if it is configured and was not invalidated since
+        generation captured before documents were read."""
+        model_info = self.doc_models_info[doc_model]
+        if model_info.cache is None or expansion.key is None or model_info.cache_generation != generation:
+            return
+        for mongo_doc in mongo_docs:
+            model_info.cache.put(expansion.key, mongo_doc[model_info.identity.alias], mongo_doc)
+
+    def _assemble_doc(
+            self,
+            doc_model: DocModel,
+            expansion: Expansion,
+            mongo_doc: MongoDoc,
+            linked_docs: dict[int, dict[Any, MongoDoc]],
+    ) -> MongoDoc:
+        """Places client joined documents by their ids and replaces ids of links which are not expanded with stubs."""
+        if not expansion.has_stubs and not expansion.has_client_joins:
+            return mongo_doc
+
+        model_info = self.doc_models_info[doc_model]
+
+        for field_name, link in model_info.links.items():
+            alias = link.local_field.alias
+            value = mongo_doc.get(alias)
+            if value is None:
+                continue
+
+            if (client_expansion := expansion.client_joined.get(field_name)) is not None:
+                # missing linked documents are skipped as in server joins
+                docs = linked_docs[id(client_expansion)]
+                match link.link_type:
+                    case "plain":
+                        if value in docs:
+                            mongo_doc[alias] = docs[value]
+                        else:
+                            del mongo_doc[alias]
+                    case "array":
+                        mongo_doc[alias] = [docs[v] for v in value if v in docs]
+                    case "dict":
+                        mongo_doc[alias] = {k: docs[v] for k, v in value.items() if v in docs}
+                continue
+
+            link_expansion = expansion.expanded.get(field_name)
 
-            back_pipeline.extend([
-                {"$lookup": lookup},
-            ])
+            def make(linked: Any) -> Any:
+                # last document of $graphLookup chain keeps stored id of its link
+                if link_expansion is None or not isinstance(linked, dict):
+                    identity_name = self.doc_models_info[link.link_to].identity.name
+                    return construct_compat(link.link_to, {identity_name: linked})
+                return self._assemble_doc(link.link_to, link_expansion, linked, linked_docs)
 
-        model_info.full_pipeline = back_pipeline
+            match link.link_type:
+                case "plain":
+                    mongo_doc[alias] = make(value)
+                case "array":
+                    mongo_doc[alias] = [make(v) for v in value]
+                case "dict":
+                    mongo_doc[alias] = {k: make(v) for k, v in value.items()}
+
+        for field_name, back_link in model_info.back_links.items():
+            value = mongo_doc.get(back_link.local_field.alias)
+            back_link_expansion = expansion.expanded.get(field_name)
+            if value is not None and back_link_expansion is not None:
+                mongo_doc[back_link.local_field.alias] = [
+                    self._assemble_doc(back_link.link_from, back_link_expansion, v, linked_docs)
+                    for v in value
+                ]
+
+        return mongo_doc
 
     async def _create_indexes(self) -> None:
         for doc_model, info in self.doc_models_info.items():
@@ -40,6 +40,21 @@ class DocumentNotFound(ButtyError):
         self.query = query
 
 
+class BulkSaveError(ButtyError):
+    def __init__(self, errors: dict[int, Exception], saved: list[int]):
+        """Raised when some documents could not be saved while saving many documents at once.
+
+        :param errors: Errors by indices of documents which were not saved.
+        :param saved: Indices of documents which were saved.
+        :ivar errors: Errors by indices of documents which were not saved
+            (DocumentNotFound, DuplicateKeyError, ButtyValueError etc.)
+        :ivar saved: Indices of saved documents, documents not listed in both were not attempted to save
+        """
+        super().__init__(f"{len(errors)} document(s) failed to save, {len(saved)} saved.")
+        self.errors = errors
+        self.saved = saved
+
+
 def _validate(
         condition: bool,
         message: str,
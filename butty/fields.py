@@ -6,13 +6,21 @@ from typing import TYPE_CHECKING, Any, Literal
 from butty.compat import FieldCompat, pydantic_undefined
 
 if TYPE_CHECKING:
-    from butty.engine import IdentityProvider, IdentityProviderFactory, VersionProvider
+    from butty.engine import (
+        IdentityBatchProvider,
+        IdentityBatchProviderFactory,
+        IdentityProvider,
+        IdentityProviderFactory,
+        VersionProvider,
+    )
 
 
 class KnownExtra(str, Enum):
     is_identity = "is_identity"
     identity_provider = "identity_provider"
     identity_provider_factory = "identity_provider_factory"
+    identity_batch_provider = "identity_batch_provider"
+    identity_batch_provider_factory = "identity_batch_provider_factory"
     link_name = "link_name"
     link_ignore = "link_ignore"
     is_index = "is_index"
@@ -21,6 +29,8 @@ class KnownExtra(str, Enum):
     is_version = "is_version"
     version_provider = "version_provider"
     is_back_link = "is_back_link"
+    max_depth = "max_depth"
+    join_strategy = "join_strategy"
 
 
 OnDelete = Literal["nothing", "propagate", "cascade"]
@@ -32,6 +42,14 @@ Possible values:
 - propagate: Delete linked documents when this document is deleted
 """
 
+JoinStrategy = Literal["server", "client"]
+"""Defines how linked documents are joined on read.
+
+Possible values:
+- server: Join with $lookup stage of aggregation pipeline
+- client: Load linked documents with separate $in request per linked model and assemble them in process
+"""
+
 
 def IndexedField(
         default: Any = pydantic_undefined,
@@ -57,6 +75,8 @@ def IdentityField(
         *,
         identity_provider: IdentityProvider | None = None,
         identity_provider_factory: IdentityProviderFactory | None = None,
+        identity_batch_provider: IdentityBatchProvider | None = None,
+        identity_batch_provider_factory: IdentityBatchProviderFactory | None = None,
         **kwargs: Any,
 ) -> Any:
     """Creates a document identity field.
@@ -64,6 +84,9 @@ def IdentityField(
     :param default: Default field value.
     :param identity_provider: Identity provider.
     :param identity_provider_factory: Factory for identity provider.
+    :param identity_batch_provider: Provider of given number of identities, used by bulk save to reserve identities
+        of new documents at once.
+    :param identity_batch_provider_factory: Factory for identity batch provider.
     :param kwargs: Additional Pydantic Field arguments.
     :return: Field definition with identity metadata.
     """
@@ -71,6 +94,8 @@ def IdentityField(
     extra[KnownExtra.is_identity] = True
     extra[KnownExtra.identity_provider] = identity_provider
     extra[KnownExtra.identity_provider_factory] = identity_provider_factory
+    extra[KnownExtra.identity_batch_provider] = identity_batch_provider
+    extra[KnownExtra.identity_batch_provider_factory] = identity_batch_provider_factory
     return FieldCompat(default, extra, **kwargs)
 
 
@@ -99,6 +124,8 @@ def LinkField(
         link_name: str | None = None,
         link_ignore: bool = False,
         on_delete: OnDelete = "nothing",
+        max_depth: int | None = None,
+        join_strategy: JoinStrategy | None = None,
         **kwargs: Any,
 ) -> Any:
     """Creates a field that links to another document.
@@ -107,6 +134,9 @@ def LinkField(
     :param link_name: Custom field name for storing link in MongoDB.
     :param link_ignore: If True, skip this field during link processing.
     :param on_delete: Behavior when linked document is deleted.
+    :param max_depth: Maximum number of link levels joined by default through this link,
+        0 to return linked document as identity stub.
+    :param join_strategy: How linked documents are joined on read (defaults to engine join strategy).
     :param kwargs: Additional Pydantic Field arguments.
     :return: Field definition with link metadata.
     """
@@ -114,19 +144,26 @@ def LinkField(
     extra[KnownExtra.link_name] = link_name
     extra[KnownExtra.link_ignore] = link_ignore
     extra[KnownExtra.on_delete] = on_delete
+    extra[KnownExtra.max_depth] = max_depth
+    extra[KnownExtra.join_strategy] = join_strategy
     return FieldCompat(default, extra, **kwargs)
 
 
 def BackLinkField(
         default: Any = pydantic_undefined,
+        *,
+        max_depth: int | None = None,
         **kwargs: Any,
 ) -> Any:
     """Creates a field that represents a back reference from another document.
 
     :param default: Default field value.
+    :param max_depth: Maximum number of link levels joined by default through this backlink,
+        0 to not join backlinked documents.
     :param kwargs: Additional Pydantic Field arguments.
     :return: Field definition with backlink metadata.
     """
     extra: dict[Any, Any] = {}
     extra[KnownExtra.is_back_link] = True
+    extra[KnownExtra.max_depth] = max_depth
     return FieldCompat(default, extra, **kwargs)
@@ -254,6 +254,79 @@ def Inc(query: Query) -> Query:
     return {"$inc": query}
 
 
+def Mul(query: Query) -> Query:
+    """Create a MongoDB $mul update operation.
+
+    :param query: Field/factor mappings to multiply by
+    :return: MongoDB update query with $mul operator
+    """
+    return {"$mul": query}
+
+
+def Min(query: Query) -> Query:
+    """Create a MongoDB $min update operation.
+
+    :param query: Field/value mappings to set if value is less than current one
+    :return: MongoDB update query with $min operator
+    """
+    return {"$min": query}
+
+
+def Max(query: Query) -> Query:
+    """Create a MongoDB $max update operation.
+
+    :param query: Field/value mappings to set if value is greater than current one
+    :return: MongoDB update query with $max operator
+    """
+    return {"$max": query}
+
+
+def Push(query: Query) -> Query:
+    """Create a MongoDB $push update operation.
+
+    :param query: Array field/value mappings to append, value can be modifiers e.g. {"$each": [...]}
+    :return: MongoDB update query with $push operator
+    """
+    return {"$push": query}
+
+
+def AddToSet(query: Query) -> Query:
+    """Create a MongoDB $addToSet update operation.
+
+    :param query: Array field/value mappings to append if not present, value can be {"$each": [...]}
+    :return: MongoDB update query with $addToSet operator
+    """
+    return {"$addToSet": query}
+
+
+def Pull(query: Query) -> Query:
+    """Create a MongoDB $pull update operation.
+
+    :param query: Array field/value or condition mappings to remove matching items
+    :return: MongoDB update query with $pull operator
+    """
+    return {"$pull": query}
+
+
+def Unset(*fields: Any) -> Query:
+    """Create a MongoDB $unset update operation.
+
+    :param fields: Fields to remove
+    :return: MongoDB update query with $unset operator
+    """
+    return {"$unset": {f: "" for f in fields}}
+
+
+def CurrentDate(*fields: Any, timestamp: bool = False) -> Query:
+    """Create a MongoDB $currentDate update operation.
+
+    :param fields: Fields to set to current date
+    :param timestamp: Set timestamp instead of date
+    :return: MongoDB update query with $currentDate operator
+    """
+    return {"$currentDate": {f: {"$type": "timestamp"} if timestamp else True for f in fields}}
+
+
 # ----------------------------------------------------
 
 MongoQuery: TypeAlias = dict[str, Any]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from butty.engine import Doc, DocModel, Expansion
+
+
+class UnitOfWork:
+    """Identity map and pending changes of documents loaded within Engine.session() scope.
+
+    Documents loaded within scope are kept by model and identity, so repeated loads return the same instance.
+    Documents changed since load and documents added explicitly are saved on exit from scope.
+    """
+
+    def __init__(self) -> None:
+        self.identity_map: dict[tuple[DocModel, Any], Doc] = {}
+        self.expansions: dict[tuple[DocModel, Any], list[Expansion]] = {}
+        """Expansions mapped documents were loaded with, to tell whether they have links of later reads joined."""
+        self.new_docs: list[Doc] = []
+        self._new_doc_ids: set[int] = set()
+
+    def add(self, doc: Doc) -> None:
+        """Add document to be saved on exit from scope, e.g. document created within scope."""
+        if id(doc) not in self._new_doc_ids:
+            self._new_doc_ids.add(id(doc))
+            self.new_docs.append(doc)
+
+
+current_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar("current_unit_of_work", default=None)
+"""Unit of work of current Engine.session() scope."""
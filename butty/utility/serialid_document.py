@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC
-from typing import TYPE_CHECKING, Annotated, Awaitable, Callable
+from typing import TYPE_CHECKING, Annotated, Awaitable, Callable, Sequence
 
 from butty import Document, F, IdentityField, Inc
 
 if TYPE_CHECKING:
-    from butty.engine import DocModel
+    from butty.engine import DocModel, IdentityProviderFactory
 
 
 class SerialIDCounter(Document[str]):
@@ -14,18 +15,71 @@ class SerialIDCounter(Document[str]):
     count: int
 
 
+async def _reserve(doc_model: DocModel, n: int) -> int:
+    """Reserves n serial ids for document model, returns the last reserved one."""
+    return (
+        await SerialIDCounter.update_document(
+            doc_model.__collection__.name,
+            Inc({F(SerialIDCounter.count): n}),
+            upsert=True,
+        )
+    ).count
+
+
 def _serial(doc_model: DocModel) -> Callable[[], Awaitable[int]]:
     async def identity_provider() -> int:
-        return (
-            await SerialIDCounter.update_document(
-                doc_model.__collection__.name,
-                Inc({F(SerialIDCounter.count): 1}),
-                upsert=True,
-            )
-        ).count
+        return await _reserve(doc_model, 1)
 
     return identity_provider
 
 
+def _serial_batch(doc_model: DocModel) -> Callable[[int], Awaitable[Sequence[int]]]:
+    async def identity_batch_provider(n: int) -> Sequence[int]:
+        last_id = await _reserve(doc_model, n)
+        return range(last_id - n + 1, last_id + 1)
+
+    return identity_batch_provider
+
+
+def serial_block_factory(
+        block_size: int = 100,
+        *,
+        max_block_size: int | None = None,
+) -> IdentityProviderFactory:
+    """Creates factory of serial identity providers, which reserve ids by blocks with a single counter update.
+
+    Ids are monotonically increasing within the process, ids reserved but not used by the process are lost.
+
+    :param block_size: Number of ids to reserve at once.
+    :param max_block_size: If given, block size is doubled on each reservation up to this size.
+    :return: Identity provider factory to use with IdentityField.
+    """
+
+    def factory(doc_model: DocModel) -> Callable[[], Awaitable[int]]:
+        lock = asyncio.Lock()
+        next_id = 1
+        last_id = 0
+        size = block_size
+
+        async def identity_provider() -> int:
+            nonlocal next_id, last_id, size
+            async with lock:
+                if next_id > last_id:
+                    last_id = await _reserve(doc_model, size)
+                    next_id = last_id - size + 1
+                    if max_block_size is not None:
+                        size = min(size * 2, max(max_block_size, block_size))
+                id_ = next_id
+                next_id += 1
+                return id_
+
+        return identity_provider
+
+    return factory
+
+
 class SerialIDDocument(Document[int], ABC):
-    id: Annotated[int | None, IdentityField(identity_provider_factory=_serial)] = None
+    id: Annotated[
+        int | None,
+        IdentityField(identity_provider_factory=_serial, identity_batch_provider_factory=_serial_batch),
+    ] = None
@@ -3,7 +3,7 @@ from typing import Annotated
 import pytest
 
 from butty import Engine, F, IndexedField
-from butty.errors import DocumentNotFound
+from butty.errors import ButtyValueError, DocumentNotFound
 from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
 from tests.misc import get_indices_names
 
@@ -42,6 +42,16 @@ async def test_basic(engine: Engine):
         await User.find_one({F(User.id): -1})
     assert await User.find_one_or_none({F(User.id): -1}) is None
 
+    assert await User.get_many([vova.id, vasya.id, vova.id]) == [vova, vasya, vova]
+    with pytest.raises(DocumentNotFound):
+        await User.get_many([vasya.id, -1])
+    assert await User.get_many([-1, vasya.id], missing="skip") == [vasya]
+    assert await User.get_many([-1, vasya.id], missing="none") == [None, vasya]
+    with pytest.raises(ButtyValueError):
+        await User.get(str(vasya.id))
+    with pytest.raises(ButtyValueError):
+        await User.get_many([vasya.id, str(vasya.id)])
+
     assert await User.count_documents(F(User.department.id) == it_department.id) == 2
     assert await User.find_and_count(F(User.department.id) == it_department.id, limit=1) == (
         [vasya],
@@ -0,0 +1,112 @@
+from typing import Annotated
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from butty import Engine, LinkField
+from butty.errors import BulkSaveError, ButtyValueError, DocumentNotFound
+from butty.fields import VersionField
+from butty.utility.oid_document import OIDDocument
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Department(SerialIDDocument):
+    name: str
+
+
+class User(SerialIDDocument):
+    name: str
+    department: Department = LinkField()
+
+
+class Note(OIDDocument):
+    text: str
+    version: Annotated[int | None, VersionField(version_provider=lambda v: 0 if v is None else v + 1)] = None
+
+
+async def test_bulk_save(engine: Engine):
+    await engine.bind(SerialIDCounter, Department, User, Note).init()
+
+    departments = await Department.save_many([Department(name=f"dep{i}") for i in range(3)], batch_size=2)
+    assert [d.id for d in departments] == [1, 2, 3]
+
+    users = [User(name=f"user{i}", department=departments[i % 3]) for i in range(5)]
+    notes = [Note(text=f"note{i}") for i in range(2)]
+    saved = await engine.bulk_save([*users, *notes])
+    assert saved == [*users, *notes]
+    assert [u.id for u in users] == [1, 2, 3, 4, 5]
+    assert all(n.id is not None and n.version == 0 for n in notes)
+
+    raw = await engine.db["User"].find_one({"id": 2})
+    assert raw["department"] == 2
+
+    assert await User.find(sort={User.id: 1}) == users
+    assert await Note.find() == notes
+
+    # updates
+    for u in users:
+        u.name += "!"
+    await User.save_many(users)
+    assert [u.name for u in await User.find(sort={User.id: 1})] == [f"user{i}!" for i in range(5)]
+
+    # optimistic versioning
+    stale = await Note.get(notes[0].id)
+    notes[0].text = "changed"
+    await Note.save_many(notes)
+    assert [n.version for n in notes] == [1, 1]
+
+    stale.text = "stale"
+    fresh = await Note.get(notes[1].id)
+    fresh.text = "fresh"
+    with pytest.raises(BulkSaveError) as e:
+        await Note.save_many([stale, fresh], ordered=False)
+    assert [*e.value.errors] == [0]
+    assert isinstance(e.value.errors[0], DocumentNotFound)
+    assert e.value.saved == [1]
+    assert stale.version == 0
+    assert fresh.version == 2
+    assert (await Note.get(notes[0].id)).text == "changed"
+
+    # ordered save stops on first failure
+    duplicate = User(id=1, name="duplicate", department=departments[0])
+    new_users = [User(name="new1", department=departments[0]), duplicate, User(name="new2", department=departments[0])]
+    with pytest.raises(BulkSaveError) as e:
+        await User.save_many(new_users, mode="insert")
+    assert isinstance(e.value.errors[1], DuplicateKeyError)
+    assert e.value.saved == [0]
+    assert new_users[2].id is None
+
+    with pytest.raises(BulkSaveError) as e:
+        await User.save_many([User(name="no department", department=Department(name="unsaved"))])
+    assert isinstance(e.value.errors[0], ButtyValueError)
+
+    with pytest.raises(ButtyValueError):
+        await User.save_many(notes)
+
+
+async def test_bulk_save_identities(engine: Engine):
+    await engine.bind(SerialIDCounter, Department).init()
+
+    reservations = []
+    find_one_and_update = SerialIDCounter.__collection__.find_one_and_update
+
+    async def find_one_and_update_spy(query, update, **kwargs):
+        reservations.append(update)
+        return await find_one_and_update(query, update, **kwargs)
+
+    SerialIDCounter.__collection__.find_one_and_update = find_one_and_update_spy
+
+    # identities of new documents of a batch are reserved with a single counter update
+    await Department(name="first").save()
+    departments = [Department(name=f"dep{i}") for i in range(5)]
+    await Department.save_many(
+        [departments[0], Department(id=100, name="given"), *departments[1:]],
+        mode="insert",
+        batch_size=3,
+    )
+    assert [d.id for d in departments] == [2, 3, 4, 5, 6]
+    assert len(reservations) == 3
+
+    # saved documents do not need identities
+    await Department.save_many(departments)
+    assert len(reservations) == 3
@@ -0,0 +1,175 @@
+import asyncio
+from collections import defaultdict
+from typing import Any
+
+import pytest
+from pymongo.errors import AutoReconnect
+
+from butty import DocumentConfigBase, Engine, F
+from butty.cache import DocumentCache
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Category(SerialIDDocument):
+    name: str
+
+    class DocumentConfig(DocumentConfigBase):
+        cache_max_size = 2
+
+
+class Product(SerialIDDocument):
+    name: str
+    category: Category
+
+
+class ChangeEvents:
+    """Stand-in for change streams, events are emitted by test."""
+
+    def __init__(self) -> None:
+        self.queues: defaultdict[str, asyncio.Queue[Any]] = defaultdict(asyncio.Queue)
+        self.resume_tokens: list[Any] = []
+
+    async def __call__(self, collection, resume_token):
+        self.resume_tokens.append(resume_token)
+        queue = self.queues[collection.name]
+        while True:
+            change = await queue.get()
+            try:
+                if isinstance(change, Exception):
+                    raise change
+                yield change
+            finally:
+                queue.task_done()
+
+    async def emit(self, collection_name: str, change: Any) -> None:
+        """Emits change event and waits until it is processed."""
+        await self.queues[collection_name].put(change)
+        await self.queues[collection_name].join()
+
+
+@pytest.fixture
+def change_events(monkeypatch):
+    monkeypatch.setattr("butty.engine._CACHE_WATCH_RETRY_DELAY", 0)
+    return ChangeEvents()
+
+
+@pytest.fixture
+def engine_options(change_events):
+    return {
+        "cache_change_source": change_events,
+    }
+
+
+async def test_cache(engine: Engine):
+    await engine.bind(SerialIDCounter, Category, Product).init()
+
+    food = await Category(name="Food").save()
+    drinks = await Category(name="Drinks").save()
+    toys = await Category(name="Toys").save()
+
+    await Product(name="Bread", category=food).save()
+    await Product(name="Milk", category=drinks).save()
+    await Product(name="Cheese", category=food).save()
+
+    assert engine.explain_joins()["Product"].lookups == 0
+
+    products = await Product.find(sort={F(Product.id): 1})
+    assert [p.category.name for p in products] == ["Food", "Drinks", "Food"]
+    assert engine.cache_stats()["Category"].misses == 2
+
+    products = await Product.find(sort={F(Product.id): 1})
+    assert [p.category.name for p in products] == ["Food", "Drinks", "Food"]
+    assert engine.cache_stats()["Category"].hits == 2
+
+    assert await Category.get(food.id) == food
+    assert engine.cache_stats()["Category"].hits == 3
+
+    # least recently used category is evicted
+    assert await Category.get(toys.id) == toys
+    stats = engine.cache_stats()["Category"]
+    assert stats.size == 2
+    assert stats.misses == 3
+
+    food.name = "Grocery"
+    await food.save()
+    assert (await Product.find_one(F(Product.name) == "Bread")).category.name == "Grocery"
+
+    toys_id = toys.id
+    await toys.delete()
+    assert await Category.find_one_or_none(F(Category.id) == toys_id) is None
+    assert (await Category.get_many([toys_id, food.id], missing="skip")) == [food]
+
+
+async def test_cache_concurrent_save(engine: Engine):
+    await engine.bind(SerialIDCounter, Category, Product).init()
+
+    food = await Category(name="Food").save()
+    aggregate = Category.__collection__.aggregate
+
+    class Cursor:
+        def __init__(self, cursor):
+            self.cursor = cursor
+
+        async def to_list(self, length):
+            res = await self.cursor.to_list(length)
+            # document is changed after it was read, before read is completed
+            Category.__collection__.aggregate = aggregate
+            await Category(id=food.id, name="Grocery").save()
+            return res
+
+    Category.__collection__.aggregate = lambda *args, **kwargs: Cursor(aggregate(*args, **kwargs))
+
+    assert (await Category.find(F(Category.id) == food.id))[0].name == "Food"
+    assert engine.cache_stats()["Category"].size == 0
+    assert (await Category.get(food.id)).name == "Grocery"
+
+
+async def test_cache_change_events(engine: Engine, change_events: ChangeEvents):
+    await engine.bind(SerialIDCounter, Category, Product).init()
+
+    food = await Category(name="Food").save()
+    drinks = await Category(name="Drinks").save()
+    await Product(name="Bread", category=food).save()
+    await Product(name="Milk", category=drinks).save()
+
+    await Product.find()
+    assert engine.cache_stats()["Category"].size == 2
+
+    # change made by other process
+    await Category.__collection__.update_one({"id": food.id}, {"$set": {"name": "Grocery"}})
+    await change_events.emit(
+        "Category",
+        {
+            "_id": "token1",
+            "operationType": "update",
+            "documentKey": {"_id": None},
+            "fullDocument": {"id": food.id, "name": "Grocery"},
+        },
+    )
+    assert engine.cache_stats()["Category"].size == 1
+    assert (await Category.get(food.id)).name == "Grocery"
+
+    # stream is resumed after error
+    await change_events.emit("Category", AutoReconnect())
+    await change_events.emit("Category", {"_id": "token2", "operationType": "drop"})
+    assert change_events.resume_tokens == [None, "token1"]
+    assert engine.cache_stats()["Category"].size == 0
+
+
+def test_document_cache():
+    cache = DocumentCache(2, None)
+    mongo_doc = {"id": 1, "tags": ["a"]}
+    cache.put("key", 1, mongo_doc)
+
+    # cached documents are not shared with read ones
+    mongo_doc["tags"].append("b")
+    cached = cache.get("key", 1)
+    assert cached == {"id": 1, "tags": ["a"]}
+    cached["tags"].append("c")
+    assert cache.get("key", 1) == {"id": 1, "tags": ["a"]}
+
+    # identity is removed with its last expired form
+    cache.ttl = -1
+    cache.put("key", 2, {"id": 2})
+    assert cache.get("key", 2) is None
+    assert cache.get_stats().size == 1
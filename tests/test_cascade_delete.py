@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from butty import Engine, LinkField
+from butty.document import hook
+from butty.utility.oid_document import OIDDocument
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Customer(OIDDocument):
+    name: str
+
+
+class Order(OIDDocument):
+    customer: Annotated[Customer, LinkField(on_delete="cascade")]
+
+
+class Attachment(SerialIDDocument):
+    name: str
+
+
+class OrderItem(SerialIDDocument):
+    order: Annotated[Order, LinkField(on_delete="cascade")]
+    attachments: Annotated[list[Attachment] | None, LinkField(on_delete="propagate")] = None
+
+
+hooks_called = []
+
+
+@hook(OrderItem, "before_delete")
+async def order_item_before_delete_hook(order_item: OrderItem) -> OrderItem:
+    hooks_called.append(order_item.id)
+    return order_item
+
+
+async def test_cascade_delete(engine: Engine):
+    await engine.bind(SerialIDCounter, Customer, Order, Attachment, OrderItem).init()
+
+    vasya = await Customer(name="Vasya").save()
+    frosya = await Customer(name="Frosya").save()
+
+    for customer in (vasya, vasya, frosya):
+        order = await Order(customer=customer).save()
+        for i in range(3):
+            attachments = await Attachment.save_many([Attachment(name=f"a{j}") for j in range(2)])
+            await OrderItem(order=order, attachments=attachments).save()
+
+    hooks_called.clear()
+    await vasya.delete()
+
+    assert vasya.id is None
+    assert sorted(hooks_called) == [1, 2, 3, 4, 5, 6]
+    assert [c.name for c in await Customer.find()] == ["Frosya"]
+    assert await Order.count_documents() == 1
+    assert [i.id for i in await OrderItem.find()] == [7, 8, 9]
+    assert [a.id for a in await Attachment.find()] == [13, 14, 15, 16, 17, 18]
@@ -0,0 +1,95 @@
+from typing import Annotated
+
+import pytest
+from pydantic import BaseModel
+
+from butty import DocumentConfigBase, Engine
+from butty.errors import DocumentNotFound
+from butty.fields import VersionField
+from butty.utility.oid_document import OIDDocument
+
+
+class Settings(BaseModel):
+    theme: str
+    notify: bool
+
+
+class Profile(OIDDocument):
+    class DocumentConfig(DocumentConfigBase):
+        track_changes = True
+
+    version: Annotated[int | None, VersionField(version_provider=lambda v: 0 if v is None else v + 1)] = None
+    name: str
+    settings: Settings
+    history: list[str]
+
+
+class Note(OIDDocument):
+    text: str
+    tags: list[str]
+
+
+async def test_changes(engine: Engine):
+    await engine.bind(Profile, Note).init()
+
+    updates = []
+
+    def spy(collection):
+        update_one = collection.update_one
+
+        async def update_one_spy(query, update, **kwargs):
+            updates.append(update)
+            return await update_one(query, update, **kwargs)
+
+        collection.update_one = update_one_spy
+
+    spy(Profile.__collection__)
+    spy(Note.__collection__)
+
+    profile = await Profile(
+        name="Vasya",
+        settings=Settings(theme="dark", notify=False),
+        history=[f"login {i}" for i in range(100)],
+    ).save()
+
+    # nothing is written if nothing is changed
+    await profile.save()
+    assert updates == []
+    assert profile.version == 0
+
+    profile = await Profile.get(profile.id)
+    profile.settings.notify = True
+    await profile.save()
+    assert updates[-1] == {"$set": {"settings.notify": True, "version": 1}}
+
+    profile.name = "Frosya"
+    profile.history.append("logout")
+    await profile.save()
+    assert updates[-1] == {"$set": {"name": "Frosya", "history": profile.history, "version": 2}}
+
+    assert await Profile.get(profile.id) == profile
+
+    # concurrent change is detected by version
+    profile1 = await Profile.get(profile.id)
+    profile2 = await Profile.get(profile.id)
+
+    profile1.name = "Vasya"
+    await profile1.save()
+
+    profile2.settings.theme = "light"
+    with pytest.raises(DocumentNotFound):
+        await profile2.save()
+
+    # documents not loaded are written entirely
+    await Profile(id=profile.id, version=3, name="Vova", settings=profile.settings, history=[]).save()
+    assert set(updates[-1]["$set"]) == {"_id", "version", "name", "settings", "history"}
+
+    # documents of models not tracking changes are written entirely
+    note = await Note(text="note", tags=["a"]).save()
+    await note.save()
+    assert set(updates[-1]["$set"]) == {"_id", "text", "tags"}
+
+    note = await Note.get(note.id)
+    note.text = "changed"
+    await note.save()
+    assert set(updates[-1]["$set"]) == {"_id", "text", "tags"}
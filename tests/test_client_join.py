@@ -0,0 +1,65 @@
+import pytest
+
+from butty import Engine, F, LinkField
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Currency(SerialIDDocument):
+    code: str
+
+
+class Country(SerialIDDocument):
+    name: str
+    currency: Currency
+
+
+class Customer(SerialIDDocument):
+    name: str
+    country: Country = LinkField(join_strategy="client")
+    visited: list[Country] | None = LinkField(None, join_strategy="client")
+    accounts: dict[str, Currency] | None = LinkField(None, join_strategy="client")
+    home: Country | None = LinkField(None, join_strategy="server")
+
+
+@pytest.fixture
+def engine_options():
+    return {
+        "join_strategy": "client",
+    }
+
+
+async def test_client_join(engine: Engine):
+    await engine.bind(SerialIDCounter, Currency, Country, Customer).init()
+
+    rub = await Currency(code="RUB").save()
+    eur = await Currency(code="EUR").save()
+    russia = await Country(name="Russia", currency=rub).save()
+    france = await Country(name="France", currency=eur).save()
+
+    await Customer(
+        name="Vasya",
+        country=russia,
+        visited=[france, russia],
+        accounts={"main": rub, "travel": eur},
+        home=russia,
+    ).save()
+    await Customer(name="Frosya", country=france).save()
+
+    assert engine.explain_joins()["Customer"].lookups == 1
+
+    vasya, frosya = await Customer.find(sort={F(Customer.id): 1})
+    assert vasya.country.name == "Russia"
+    assert vasya.country.currency.code == "RUB"
+    assert [c.name for c in vasya.visited or []] == ["France", "Russia"]
+    assert {k: c.code for k, c in (vasya.accounts or {}).items()} == {"main": "RUB", "travel": "EUR"}
+    assert vasya.home is not None
+    assert vasya.home.currency.code == "RUB"
+    assert frosya.country.currency.code == "EUR"
+    assert frosya.visited is None
+
+    assert [c.name async for c in Customer.find_iter(F(Customer.country.name) == "France")] == ["Frosya"]
+    assert await Customer.count_documents(F(Customer.country.currency.code) == "RUB") == 1
+
+    frosya = await Customer.get(frosya.id, expand=[Customer.country])
+    assert frosya.country.name == "France"
+    assert frosya.country.currency.__dict__.get("code") is None
@@ -1,6 +1,9 @@
 from typing import Optional, Union
 
-from butty.compat import AnnotationCompat
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from butty.compat import AnnotationCompat, TypeAdapterCompat
 
 
 def test_annotation():
@@ -55,3 +58,15 @@ def test_annotation():
     assert AnnotationCompat(None).core_type is None
     assert AnnotationCompat(None).outer_type is None
     assert not AnnotationCompat(None).optional
+
+
+class Foo(BaseModel):
+    bar: int
+
+
+def test_type_adapter():
+    assert TypeAdapterCompat(Foo).validate({"bar": 1}) == Foo(bar=1)
+    assert TypeAdapterCompat(list[Foo]).validate([{"bar": 1}, {"bar": "2"}]) == [Foo(bar=1), Foo(bar=2)]
+
+    with pytest.raises(ValidationError):
+        TypeAdapterCompat(Foo).validate({"bar": "baz"})
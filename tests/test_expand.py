@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import pytest
+
+from butty import BackLinkField, Engine, F, LinkField
+from butty.compat import model_rebuild_compat
+from butty.errors import ButtyValueError
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Company(SerialIDDocument):
+    name: str
+
+
+class Department(SerialIDDocument):
+    name: str
+    company: Company
+    users: list[User] | None = BackLinkField(None)
+
+
+class User(SerialIDDocument):
+    name: str
+    department: Department
+    companies: list[Company] | None = LinkField(None)
+
+
+model_rebuild_compat(Department)
+
+
+async def test_expand(engine: Engine):
+    await engine.bind(SerialIDCounter, Company, Department, User).init()
+
+    company = await Company(name="Horns and Hoofs").save()
+    department = await Department(name="IT", company=company).save()
+    await User(name="Vasya", department=department).save()
+    await User(name="Frosya", department=department, companies=[company]).save()
+
+    frosya = await User.find_one(F(User.name) == "Frosya", expand=[])
+    assert frosya.department.id == department.id
+    assert frosya.department.__dict__.get("name") is None
+    assert [c.id for c in frosya.companies or []] == [company.id]
+
+    frosya = await User.find_one(F(User.name) == "Frosya", expand=[User.department])
+    assert frosya.department.name == "IT"
+    assert frosya.department.company.id == company.id
+    assert frosya.department.company.__dict__.get("name") is None
+    assert frosya.department.users is None
+
+    frosya = await User.get(frosya.id, expand=["department.company", "companies"])
+    assert frosya.department.company.name == "Horns and Hoofs"
+    assert [c.name for c in frosya.companies or []] == ["Horns and Hoofs"]
+
+    users = await User.find(F(User.department.name) == "IT", sort={F(User.name): 1}, expand=[])
+    assert [u.name for u in users] == ["Frosya", "Vasya"]
+    assert users[0].department.name == "IT"
+
+    department = await Department.get(department.id, expand=[Department.users])
+    assert [u.name for u in department.users or []] == ["Vasya", "Frosya"]
+    assert department.company.__dict__.get("name") is None
+
+    with pytest.raises(ButtyValueError):
+        await User.find(expand=[User.name])
@@ -0,0 +1,34 @@
+import pytest
+
+from butty import Engine, F
+from butty.errors import ButtyValueError
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Item(SerialIDDocument):
+    name: str
+
+
+async def test_find_iter(engine: Engine):
+    await engine.bind(SerialIDCounter, Item).init()
+
+    for i in range(10):
+        await Item(name=f"Item{i}").save()
+
+    names = [f"Item{i}" for i in range(10)]
+    for batch_size, prefetch in [(None, 1), (3, 0), (3, 1), (4, 3), (20, 2)]:
+        items = Item.find_iter(sort={F(Item.id): 1}, batch_size=batch_size, prefetch=prefetch)
+        assert [item.name async for item in items] == names
+
+    # iteration can be stopped before all batches are read
+    async for item in Item.find_iter(sort={F(Item.id): 1}, batch_size=2, prefetch=2):
+        if item.name == "Item2":
+            break
+
+    with pytest.raises(ButtyValueError):
+        async for _ in Item.find_iter(prefetch=-1):
+            pass
+    for batch_size in [0, -1]:
+        with pytest.raises(ButtyValueError):
+            async for _ in Item.find_iter(batch_size=batch_size):
+                pass
@@ -0,0 +1,72 @@
+import base64
+
+import bson
+import pytest
+
+from butty import Engine, F
+from butty.errors import ButtyValueError
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Department(SerialIDDocument):
+    name: str
+
+
+class User(SerialIDDocument):
+    name: str
+    age: int | None
+    department: Department
+
+
+async def test_find_page(engine: Engine):
+    await engine.bind(SerialIDCounter, Department, User).init()
+
+    it = await Department(name="IT").save()
+    hr = await Department(name="HR").save()
+    for i, age in enumerate([30, 20, None, 30, 40, None, 20]):
+        await User(name=f"User{i}", age=age, department=it if i % 2 else hr).save()
+
+    async def find_pages(query=None, **kwargs):
+        pages = []
+        token = None
+        while True:
+            users, token = await User.find_page(query, after=token, limit=2, **kwargs)
+            pages.append([u.name for u in users])
+            if token is None:
+                return pages
+
+    # ties are ordered by identity
+    assert await find_pages(sort={F(User.age): 1}) == [
+        ["User2", "User5"], ["User1", "User6"], ["User0", "User3"], ["User4"],
+    ]
+    assert await find_pages(sort={F(User.age): -1}) == [
+        ["User4", "User0"], ["User3", "User1"], ["User6", "User2"], ["User5"],
+    ]
+    assert await find_pages(F(User.department.name) == "IT", sort={F(User.age): -1}) == [
+        ["User3", "User1"], ["User5"],
+    ]
+    assert await find_pages() == [
+        ["User0", "User1"], ["User2", "User3"], ["User4", "User5"], ["User6"],
+    ]
+    assert await find_pages(F(User.age) == 100) == [[]]
+
+    _, token = await User.find_page(sort={F(User.age): 1}, limit=2)
+    with pytest.raises(ButtyValueError):
+        await User.find_page(sort={F(User.name): 1}, after=token, limit=2)
+    with pytest.raises(ButtyValueError):
+        await User.find_page(sort={F(User.age): 1}, after="invalid", limit=2)
+
+    # well-formed tokens of wrong shape
+    for decoded in [
+        {"keys": [["age", 1], ["id", 1]]},
+        {"values": [1, 1]},
+        {"keys": 1, "values": [1, 1]},
+        {"keys": [["age", 1], ["id", 1]], "values": [1]},
+        {"keys": [["age", 1], ["id", 1]], "values": "ab"},
+    ]:
+        with pytest.raises(ButtyValueError):
+            await User.find_page(
+                sort={F(User.age): 1},
+                after=base64.urlsafe_b64encode(bson.encode(decoded)).decode(),
+                limit=2,
+            )
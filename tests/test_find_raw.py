@@ -0,0 +1,55 @@
+from butty import Engine, F
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Company(SerialIDDocument):
+    name: str
+
+
+class Department(SerialIDDocument):
+    name: str
+    company: Company
+
+
+class User(SerialIDDocument):
+    name: str
+    age: int
+    department: Department
+
+
+async def test_find_raw(engine: Engine):
+    await engine.bind(SerialIDCounter, Company, Department, User).init()
+
+    pipelines = []
+    aggregate = User.__collection__.aggregate
+
+    def aggregate_spy(pipeline, **kwargs):
+        pipelines.append(pipeline)
+        return aggregate(pipeline, **kwargs)
+
+    User.__collection__.aggregate = aggregate_spy
+
+    acme = await Company(name="Acme").save()
+    it = await Department(name="IT", company=acme).save()
+    sales = await Department(name="Sales", company=acme).save()
+    await User(name="Vasya", age=30, department=it).save()
+    await User(name="Frosya", age=25, department=sales).save()
+
+    # identity of linked document is projected from stored id w/o join
+    assert await User.find_raw(
+        F(User.age) > 20,
+        fields=[F(User.name), F(User.department.id)],
+        sort={F(User.name): 1},
+    ) == [
+        {"name": "Frosya", "department": {"id": sales.id}},
+        {"name": "Vasya", "department": {"id": it.id}},
+    ]
+    assert "$lookup" not in str(pipelines[-1])
+
+    assert await User.find_raw(
+        F(User.department.name) == "IT",
+        fields=[F(User.id), F(User.department.id), F(User.department.company.name)],
+    ) == [
+        {"id": 1, "department": {"id": it.id, "company": {"name": "Acme"}}},
+    ]
+    assert str(pipelines[-1]).count("$lookup") == 2
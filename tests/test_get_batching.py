@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from butty import Engine
+from butty.errors import DocumentNotFound
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Department(SerialIDDocument):
+    name: str
+
+
+@pytest.fixture
+def engine_options():
+    return {
+        "get_batch_window": 0,
+    }
+
+
+async def test_get_batching(engine: Engine):
+    await engine.bind(SerialIDCounter, Department).init()
+
+    departments = await Department.save_many([Department(name=f"dep{i}") for i in range(3)])
+
+    requested_ids = []
+    load = engine._load_client_joined
+
+    async def load_spy(doc_model, expansion, ids, session):
+        requested_ids.append(ids)
+        return await load(doc_model, expansion, ids, session)
+
+    engine._load_client_joined = load_spy
+
+    res = await asyncio.gather(*[Department.get(i % 3 + 1) for i in range(9)])
+    assert res == [departments[i % 3] for i in range(9)]
+    # request is shared, instances are not
+    assert res[0] is not res[3]
+    assert requested_ids == [[1, 2, 3]]
+
+    res = await asyncio.gather(Department.get(1), Department.get(-1), return_exceptions=True)
+    assert res[0] == departments[0]
+    assert isinstance(res[1], DocumentNotFound)
+    assert requested_ids[1:] == [[1, -1]]
+
+    assert await Department.get(2) == departments[1]
+    assert len(requested_ids) == 3
+
+    # callers are released if resolving is cancelled
+    async def load_cancelled(doc_model, expansion, ids, session):
+        raise asyncio.CancelledError()
+
+    engine._load_client_joined = load_cancelled
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(Department.get(1), 1)
+
+
+async def test_get_batching_sessions(engine: Engine):
+    await engine.bind(SerialIDCounter, Department).init()
+
+    department = await Department(name="IT").save()
+
+    async def edit_and_fail():
+        async with engine.session():
+            doc = await Department.get(department.id)
+            doc.name = "HR"
+            raise RuntimeError()
+
+    async def read():
+        async with engine.session():
+            doc = await Department.get(department.id)
+            await asyncio.sleep(0)
+        return doc
+
+    failed, doc = await asyncio.gather(edit_and_fail(), read(), return_exceptions=True)
+    assert isinstance(failed, RuntimeError)
+    assert doc.name == "IT"
+    assert (await Department.get(department.id)).name == "IT"
@@ -113,3 +113,14 @@ async def test_basic(engine: Engine):
     assert await Foo.find(sort={"id": 1}) == foos[5:10] + foos[15:]
     assert await Bar.count_documents() == 1
     assert await Baz.find() == [bazs[1]]
+
+    # order of linked documents is preserved
+    bar3 = await Bar(name="bar3", foos=[foos[7], foos[6], foos[7]], foos_d={}).save()
+    bar3 = await Bar.get(bar3.id)
+    assert bar3.foos == [foos[7], foos[6], foos[7]]
+    assert bar3.foos_d == {}
+
+    bar4 = await Bar(name="bar4", foos_d={"b": foos[8], "a": foos[9], "c": foos[8]}).save()
+    bar4 = await Bar.get(bar4.id)
+    assert bar4.foos is None
+    assert [*bar4.foos_d.items()] == [("b", foos[8]), ("a", foos[9]), ("c", foos[8])]
@@ -0,0 +1,57 @@
+import pytest
+
+from butty import Engine, LinkField
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Country(SerialIDDocument):
+    name: str
+
+
+class City(SerialIDDocument):
+    name: str
+    country: Country
+
+
+class Customer(SerialIDDocument):
+    name: str
+    city: City
+    home_city: City | None = LinkField(None, max_depth=0)
+
+
+class Order(SerialIDDocument):
+    customer: Customer
+
+
+@pytest.fixture
+def engine_options():
+    return {
+        "max_depth": 2,
+    }
+
+
+async def test_max_depth(engine: Engine):
+    await engine.bind(SerialIDCounter, Country, City, Customer, Order).init()
+
+    stats = engine.explain_joins()
+    assert (stats["Order"].lookups, stats["Order"].depth) == (2, 2)
+    assert (stats["Customer"].lookups, stats["Customer"].depth) == (2, 2)
+
+    country = await Country(name="Russia").save()
+    city = await City(name="Moscow", country=country).save()
+    customer = await Customer(name="Vasya", city=city, home_city=city).save()
+    order = await Order(customer=customer).save()
+
+    order = await Order.get(order.id)
+    assert order.customer.city.name == "Moscow"
+    assert order.customer.city.country.id == country.id
+    assert order.customer.city.country.__dict__.get("name") is None
+    assert order.customer.home_city is not None
+    assert order.customer.home_city.id == city.id
+    assert order.customer.home_city.__dict__.get("name") is None
+
+    customer = await Customer.get(customer.id)
+    assert customer.city.country.name == "Russia"
+
+    order = await Order.get(order.id, expand=["customer.city.country"])
+    assert order.customer.city.country.name == "Russia"
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import pytest
+
+from butty import Engine, F, LinkField, Q
+from butty.errors import ButtyValueError
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+BaseDocument = SerialIDDocument
+
+
+class Department(BaseDocument):
+    name: str
+
+
+class User(BaseDocument):
+    name: str
+    department: Department = LinkField()
+    mentors: list[Department] | None = LinkField(None)
+
+
+@pytest.fixture
+def engine_options():
+    return {
+        "link_name_format": lambda f: f.alias + "_id",
+    }
+
+
+async def test_pushdown(engine: Engine):
+    await engine.bind(SerialIDCounter, Department, User).init()
+    info = engine.doc_models_info[User]
+    assert info.default_expansion is not None
+    default_pipeline = info.default_expansion.pipeline
+
+    def get_find_pipeline(query, **kwargs):
+        expansion = engine._get_find_expansion(User, query, kwargs.get("sort"), None)
+        return engine._get_find_pipeline(info, query, expansion=expansion, **kwargs)
+
+    it = await Department(name="IT").save()
+    sales = await Department(name="Sales").save()
+
+    vasya = await User(name="Vasya", department=it, mentors=[sales]).save()
+    frosya = await User(name="Frosya", department=it).save()
+    vova = await User(name="Vova", department=sales, mentors=[it, sales]).save()
+
+    # stored fields and link ids are matched before joins
+    query = Q((F(User.name) != "Vasya") & (F(User.department.id) == it.id) & (F(User.mentors[...].id) == sales.id))
+    pipeline = get_find_pipeline(query)
+    assert pipeline[0] == {"$match": {"$and": [
+        {"name": {"$ne": "Vasya"}},
+        {"department_id": {"$eq": it.id}},
+        {"mentors_id": {"$eq": sales.id}},
+    ]}}
+    assert pipeline[1:] == default_pipeline
+
+    # joined fields are matched after joins
+    query = Q((F(User.name) != "Vasya") & (F(User.department.name) == "IT"))
+    pipeline = get_find_pipeline(query)
+    assert pipeline[0] == {"$match": {"name": {"$ne": "Vasya"}}}
+    assert pipeline[-1] == {"$match": {"department.name": {"$eq": "IT"}}}
+
+    query = Q((F(User.name) == "Vasya") | (F(User.department.name) == "Sales"))
+    pipeline = get_find_pipeline(query)
+    assert pipeline[0] == default_pipeline[0]
+
+    # pagination is applied before joins when sort does not require them
+    query = Q(F(User.department.id) == it.id)
+    pipeline = get_find_pipeline(query, sort={User.name: 1}, skip=1, limit=1)
+    assert pipeline[:4] == [
+        {"$match": {"department_id": {"$eq": it.id}}},
+        {"$sort": {"name": 1}},
+        {"$skip": 1},
+        {"$limit": 1},
+    ]
+
+    pipeline = get_find_pipeline({}, sort={User.department.name: 1}, limit=1)
+    assert pipeline[-2:] == [{"$sort": {"department.name": 1}}, {"$limit": 1}]
+
+    assert await User.find(F(User.department.id) == it.id, sort={User.name: 1}) == [frosya, vasya]
+    assert await User.find(F(User.mentors[...].id) == it.id) == [vova]
+    assert await User.find(F(User.mentors[0].id) == sales.id) == [vasya]
+    assert await User.find(
+        (F(User.name) % "V") & (F(User.department.name) == "Sales"),
+    ) == [vova]
+    assert await User.count_documents(F(User.department.id) == it.id) == 2
+    assert await User.count_documents((F(User.name) % "V") & (F(User.department.name) == "IT")) == 1
+    assert await User.find_and_count(F(User.department.id) == it.id, sort={User.name: 1}, limit=1) == ([frosya], 2)
+
+
+async def test_count(engine: Engine):
+    await engine.bind(SerialIDCounter, Department, User).init()
+
+    it = await Department(name="IT").save()
+    await User(name="Vasya", department=it).save()
+    await User(name="Frosya", department=it).save()
+
+    assert await User.count_documents() == 2
+    assert await User.count_documents(estimated=True) == 2
+    assert await User.count_documents(F(User.department.id) == it.id) == 2
+    assert await User.count_documents(F(User.name) == "Vova") == 0
+    assert await User.count_documents(F(User.department.name) == "Sales") == 0
+    assert await User.find_and_count(F(User.department.name) == "Sales") == ([], 0)
+
+    with pytest.raises(ButtyValueError):
+        await User.count_documents(F(User.name) == "Vasya", estimated=True)
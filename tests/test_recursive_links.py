@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import pytest
+
+from butty import BackLinkField, Engine, F, LinkField
+from butty.compat import model_rebuild_compat
+from butty.errors import ButtyValueError
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Category(SerialIDDocument):
+    name: str
+    parent: Category | None = LinkField(None, link_name="parent_id")
+    children: list[Category] | None = BackLinkField(None)
+
+
+class Employee(SerialIDDocument):
+    name: str
+    manager: Employee | None = LinkField(None, max_depth=2)
+
+
+class Office(SerialIDDocument):
+    city: str
+
+
+class Worker(SerialIDDocument):
+    name: str
+    office: Office | None = None
+    mentor: Worker | None = LinkField(None)
+    mentees: list[Worker] | None = BackLinkField(None)
+
+
+class Team(SerialIDDocument):
+    name: str
+    lead: Lead | None = None
+
+
+class Lead(SerialIDDocument):
+    name: str
+    team: Team | None = None
+
+
+model_rebuild_compat(Category)
+model_rebuild_compat(Team)
+model_rebuild_compat(Worker)
+
+
+@pytest.fixture
+def engine_options():
+    return {
+        "collection_name_format": lambda m: m.__name__.lower() + "s",
+    }
+
+
+async def test_recursive_links(engine: Engine):
+    await engine.bind(SerialIDCounter, Category, Employee, Team, Lead).init()
+
+    assert engine.explain_joins()["Category"].lookups == 2
+
+    goods = await Category(name="Goods").save()
+    computers = await Category(name="Computers", parent=goods).save()
+    laptops = await Category(name="Laptops", parent=computers).save()
+    await Category(name="Gaming Laptops", parent=laptops).save()
+    await Category(name="Office Laptops", parent=laptops).save()
+    await Category(name="Phones", parent=goods).save()
+
+    laptops = await Category.get(laptops.id)
+    assert laptops.parent is not None
+    assert laptops.parent.name == "Computers"
+    assert laptops.parent.parent is not None
+    assert laptops.parent.parent.name == "Goods"
+    assert laptops.parent.parent.parent is None
+    assert sorted(c.name for c in laptops.children or []) == ["Gaming Laptops", "Office Laptops"]
+
+    goods = await Category.get(goods.id)
+    assert goods.parent is None
+    assert sorted(c.name for c in goods.children or []) == ["Computers", "Phones"]
+    computers = next(c for c in goods.children or [] if c.name == "Computers")
+    assert [c.name for c in computers.children or []] == ["Laptops"]
+    assert len((computers.children or [])[0].children or []) == 2
+    assert computers.parent is not None
+    assert computers.parent.id == goods.id
+
+    assert [c.name for c in await Category.find(F(Category.parent.parent.name) == "Goods")] == ["Laptops"]
+
+    boss = await Employee(name="Boss").save()
+    manager = await Employee(name="Manager", manager=boss).save()
+    lead = await Employee(name="Lead", manager=manager).save()
+    developer = await Employee(name="Developer", manager=lead).save()
+
+    developer = await Employee.get(developer.id)
+    assert developer.manager is not None
+    assert developer.manager.name == "Lead"
+    assert developer.manager.manager is not None
+    assert developer.manager.manager.name == "Manager"
+    assert developer.manager.manager.manager is not None
+    assert developer.manager.manager.manager.id == boss.id
+    assert developer.manager.manager.manager.__dict__.get("name") is None
+
+    team = await Team(name="Backend").save()
+    team_lead = await Lead(name="Vasya", team=team).save()
+    team.lead = team_lead
+    await team.save()
+
+    team = await Team.get(team.id)
+    assert team.lead is not None
+    assert team.lead.name == "Vasya"
+    assert team.lead.team is not None
+    assert team.lead.team.id == team.id
+
+
+async def test_recursive_links_paths(engine: Engine):
+    await engine.bind(SerialIDCounter, Office, Worker).init()
+
+    office = await Office(city="Moscow").save()
+    mentor = await Worker(name="Mentor", office=office).save()
+    await Worker(name="Mentee", office=office, mentor=mentor).save()
+
+    # paths by recursive field are joined
+    assert [w.name for w in await Worker.find(F(Worker.mentor.name) == "Mentor")] == ["Mentee"]
+    assert [w.name for w in await Worker.find(F(Worker.office.city) == "Moscow", sort={Worker.name: 1})] == [
+        "Mentee",
+        "Mentor",
+    ]
+
+    # other links of recursively joined documents are ids, so paths past them are rejected
+    with pytest.raises(ButtyValueError, match="Worker.mentor.office"):
+        await Worker.find(F(Worker.mentor.office.city) == "Moscow")
+    with pytest.raises(ButtyValueError, match="Worker.mentor.office"):
+        await Worker.find(sort={Worker.mentor.office.city: 1})
+    with pytest.raises(ButtyValueError, match="Worker.mentor.office"):
+        await Worker.find(expand=["mentor.office"])
+    with pytest.raises(ButtyValueError, match="Worker.mentees.mentor"):
+        await Worker.find(F(Worker.mentees.mentor.name) == "Mentor")
@@ -0,0 +1,27 @@
+import asyncio
+from typing import Annotated
+
+from butty import Document, Engine, IdentityField
+from butty.utility.serialid_document import SerialIDCounter, serial_block_factory
+
+
+class User(Document[int]):
+    id: Annotated[int | None, IdentityField(identity_provider_factory=serial_block_factory(3, max_block_size=6))] = None
+    name: str
+
+
+async def test_serial_block(engine: Engine):
+    await engine.bind(SerialIDCounter, User).init()
+
+    users = [await User(name=f"user{i}").save() for i in range(5)]
+    assert [u.id for u in users] == [1, 2, 3, 4, 5]
+    assert (await SerialIDCounter.get("User")).count == 9
+
+    users = await asyncio.gather(*[User(name=f"user{i}").save() for i in range(5, 10)])
+    assert sorted(u.id for u in users) == [6, 7, 8, 9, 10]
+
+    users = await User.save_many([User(name=f"user{i}") for i in range(10, 13)])
+    assert [u.id for u in users] == [11, 12, 13]
+    assert (await SerialIDCounter.get("User")).count == 15
+
+    assert await User.count_documents() == 13
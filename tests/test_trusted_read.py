@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import Annotated, Literal
+
+from pydantic import BaseModel, Field
+
+from butty import BackLinkField, DocumentConfigBase, Engine, F, LinkField
+from butty.compat import model_rebuild_compat
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Status(str, Enum):
+    ACTIVE = "active"
+    BLOCKED = "blocked"
+
+
+class Address(BaseModel):
+    city: str
+    zip_code: str | None = None
+
+
+class Department(SerialIDDocument):
+    name: str
+    users: list[User] | None = BackLinkField(None)
+
+
+class User(SerialIDDocument):
+    name: str
+    status: Status
+    created: datetime
+    addresses: list[Address]
+    tags: tuple[str, ...] = ()
+    department: Department = LinkField(join_strategy="client")
+    mentor: User | None = LinkField(None)
+
+
+model_rebuild_compat(Department)
+model_rebuild_compat(User)
+
+
+class Cat(BaseModel):
+    kind: Literal["cat"] = "cat"
+    lives: int
+
+
+class Dog(BaseModel):
+    kind: Literal["dog"] = "dog"
+    breed: str
+
+
+class Owner(SerialIDDocument):
+    pet: Cat | Dog
+    favorite: Annotated[Cat | Dog, Field(discriminator="kind")]
+    pets: list[Cat | Dog | None]
+    nickname: int | str
+
+
+class Tag(SerialIDDocument):
+    name: str
+
+    class DocumentConfig(DocumentConfigBase):
+        validate_on_read = False
+
+
+async def test_trusted_read(engine: Engine):
+    await engine.bind(SerialIDCounter, Department, User, Tag).init()
+
+    it = await Department(name="IT").save()
+    vasya = await User(
+        name="Vasya",
+        status=Status.ACTIVE,
+        created=datetime(2020, 1, 1),
+        addresses=[Address(city="Moscow", zip_code="101000")],
+        department=it,
+    ).save()
+    await User(
+        name="Frosya",
+        status=Status.BLOCKED,
+        created=datetime(2021, 1, 1),
+        addresses=[Address(city="Paris")],
+        tags=("admin",),
+        department=it,
+        mentor=vasya,
+    ).save()
+
+    validated = await User.find(sort={F(User.id): 1})
+    constructed = await User.find(sort={F(User.id): 1}, validate=False)
+    assert constructed == validated
+
+    frosya = constructed[1]
+    assert frosya.status is Status.BLOCKED
+    assert isinstance(frosya.addresses[0], Address)
+    assert frosya.tags == ("admin",)
+    assert isinstance(frosya.department, Department)
+    assert isinstance(frosya.mentor, User) and frosya.mentor.name == "Vasya"
+
+    department = await Department.find_one(F(Department.id) == it.id, validate=False)
+    assert [u.name for u in department.users] == ["Vasya", "Frosya"]
+
+    assert [u async for u in User.find_iter(sort={F(User.id): 1}, validate=False)] == validated
+    assert (await User.find_and_count(sort={F(User.id): 1}, validate=False))[0] == validated
+
+    # model config applies to all reads
+    tag = await Tag(name="new").save()
+    assert await Tag.get(tag.id) == tag
+    assert await Tag.find(validate=True) == [tag]
+
+
+async def test_trusted_read_unions(engine: Engine):
+    await engine.bind(SerialIDCounter, Owner).init()
+
+    owner = await Owner(
+        pet=Dog(breed="husky"),
+        favorite=Cat(lives=9),
+        pets=[Cat(lives=7), None, Dog(breed="pug")],
+        nickname="Vasya",
+    ).save()
+
+    # values of unions of models are validated, as their type is not known w/o validation
+    constructed = await Owner.find_one(F(Owner.id) == owner.id, validate=False)
+    assert constructed == owner
+    assert isinstance(constructed.pet, Dog)
+    assert isinstance(constructed.favorite, Cat)
+    assert [type(p) for p in constructed.pets] == [Cat, type(None), Dog]
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import pytest
+
+from butty import BackLinkField, Engine, F, LinkField, Set
+from butty.compat import model_rebuild_compat
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Customer(SerialIDDocument):
+    name: str
+
+
+class Order(SerialIDDocument):
+    number: int
+    customer: Customer
+
+
+class Invoice(SerialIDDocument):
+    order: Order
+    customer: Customer
+
+
+class Team(SerialIDDocument):
+    name: str
+    members: tuple[Member, ...] | None = BackLinkField(None)
+
+
+class Member(SerialIDDocument):
+    name: str
+    team: Team
+
+
+class Project(SerialIDDocument):
+    name: str
+    teams: tuple[Team, ...] = LinkField()
+
+
+model_rebuild_compat(Team)
+
+
+async def test_identity_map(engine: Engine):
+    await engine.bind(SerialIDCounter, Customer, Order, Invoice).init()
+
+    vasya = await Customer(name="Vasya").save()
+    order = await Order(number=1, customer=vasya).save()
+    await Invoice(order=order, customer=vasya).save()
+
+    async with engine.session() as s:
+        customer = await Customer.get(vasya.id)
+        assert await Customer.get(vasya.id) is customer
+        assert (await Customer.get_many([vasya.id]))[0] is customer
+
+        invoice = await Invoice.find_one(F(Invoice.customer.id) == vasya.id)
+        assert invoice.customer is customer
+        assert invoice.order.customer is customer
+        assert [o async for o in Order.find_iter()][0] is invoice.order
+
+        customer.name = "Frosya"
+        s.add(Customer(name="Petya"))
+
+    assert [c.name for c in await Customer.find(sort={F(Customer.id): 1})] == ["Frosya", "Petya"]
+    assert (await Invoice.find_one(F(Invoice.id) == invoice.id)).order.customer.name == "Frosya"
+
+    # changes are discarded on error
+    with pytest.raises(RuntimeError):
+        async with engine.session():
+            customer = await Customer.get(vasya.id)
+            customer.name = "Vasya"
+            raise RuntimeError()
+
+    assert (await Customer.get(vasya.id)).name == "Frosya"
+
+    # instances outside of scope are not shared
+    assert await Customer.get(vasya.id) is not await Customer.get(vasya.id)
+
+
+async def test_identity_map_delete(engine: Engine):
+    await engine.bind(SerialIDCounter, Customer, Order, Invoice).init()
+
+    vasya = await Customer(name="Vasya").save()
+
+    async with engine.session():
+        customer = await Customer.get(vasya.id)
+        customer.name = "Frosya"
+        await customer.delete()
+
+    assert await Customer.find() == []
+
+
+async def test_identity_map_expand(engine: Engine):
+    await engine.bind(SerialIDCounter, Customer, Order, Invoice).init()
+
+    vasya = await Customer(name="Vasya").save()
+    petya = await Customer(name="Petya").save()
+    order = await Order(number=1, customer=vasya).save()
+    await Order(number=2, customer=vasya).save()
+
+    async with engine.session():
+        shallow = await Order.get(order.id, expand=[])
+        assert await Order.get(order.id, expand=[]) is shallow
+
+        # links joined by later reads are set to mapped instance
+        assert await Order.get(order.id) is shallow
+        assert shallow.customer.name == "Vasya"
+        assert shallow.customer is await Customer.get(vasya.id)
+        assert (await Order.find(sort={F(Order.id): 1}))[0] is shallow
+
+    async with engine.session():
+        shallow = (await Order.get_many([order.id], expand=[]))[0]
+        customer = await Customer.get(petya.id)
+        shallow.customer = customer
+
+        # links changed in mapped instance are kept
+        assert await Order.get(order.id) is shallow
+        assert shallow.customer is customer
+
+    assert (await Order.get(order.id)).customer.name == "Petya"
+
+
+async def test_identity_map_update_many(engine: Engine):
+    await engine.bind(SerialIDCounter, Customer, Order, Invoice).init()
+
+    vasya = await Customer(name="Vasya").save()
+    petya = await Customer(name="Petya").save()
+
+    async with engine.session():
+        customer = await Customer.get(vasya.id)
+        customer.name = "Frosya"
+        updated = await Customer.get(petya.id)
+        assert await Customer.update_many(F(Customer.id) == petya.id, Set({F(Customer.name): "Vova"})) == 1
+        assert await Customer.get(vasya.id) is customer
+        assert await Customer.get(petya.id) is not updated
+
+    assert [c.name for c in await Customer.find(sort={F(Customer.id): 1})] == ["Frosya", "Vova"]
+
+
+async def test_unit_of_work_link_order(engine: Engine):
+    await engine.bind(SerialIDCounter, Customer, Order, Invoice).init()
+
+    async with engine.session() as s:
+        customer = Customer(name="Vasya")
+        order = Order(number=1, customer=customer)
+        invoice = Invoice(order=order, customer=customer)
+        # pydantic v1 copies models given to constructor
+        order.customer = invoice.customer = customer
+        invoice.order = order
+        s.add(invoice)
+        s.add(order)
+        s.add(customer)
+        s.add(customer)
+
+    invoice = await Invoice.find_one(F(Invoice.order.id) == order.id)
+    assert invoice.order.id == order.id
+    assert invoice.customer.id == invoice.order.customer.id == customer.id
+    assert len(await Customer.find()) == 1
+
+
+async def test_identity_map_tuple_links(engine: Engine):
+    await engine.bind(SerialIDCounter, Team, Member, Project).init()
+
+    team = await Team(name="Team").save()
+    vasya = await Member(name="Vasya", team=team).save()
+    await Project(name="Project", teams=(team,)).save()
+
+    async with engine.session():
+        project = await Project.find_one(F(Project.name) == "Project")
+        assert isinstance(project.teams, tuple)
+        assert project.teams[0] is await Team.get(team.id)
+
+    async with engine.session():
+        member = await Member.get(vasya.id)
+        team = await Team.find_one(F(Team.name) == "Team")
+        assert isinstance(team.members, tuple)
+        assert team.members[0] is member
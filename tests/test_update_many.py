@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Annotated
+
+from butty import (
+    AddToSet,
+    CurrentDate,
+    Engine,
+    F,
+    Inc,
+    LinkField,
+    Max,
+    Min,
+    Mul,
+    Pull,
+    Push,
+    Q,
+    Set,
+    Unset,
+)
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Shop(SerialIDDocument):
+    name: str
+
+
+class Product(SerialIDDocument):
+    shop: Annotated[Shop, LinkField(on_delete="cascade")]
+    name: str
+    price: float
+    stock: int
+    tags: list[str]
+    note: str | None = None
+    updated: datetime | None = None
+
+
+class Review(SerialIDDocument):
+    product: Annotated[Product, LinkField(on_delete="cascade")]
+    text: str
+
+
+async def test_update_many(engine: Engine):
+    await engine.bind(SerialIDCounter, Shop, Product, Review).init()
+
+    lavka = await Shop(name="Lavka").save()
+    ashan = await Shop(name="Ashan").save()
+    await Product(shop=lavka, name="Bread", price=10, stock=5, tags=["food"], note="fresh").save()
+    await Product(shop=lavka, name="Milk", price=20, stock=0, tags=["food", "cold"]).save()
+    await Product(shop=ashan, name="Ball", price=30, stock=3, tags=["toy"]).save()
+
+    assert Q(
+        Push({F(Product.tags): "new"})
+        | Pull({F(Product.tags): "cold"})
+        | Unset(F(Product.note))
+        | CurrentDate(F(Product.updated)),
+    ) == {
+        "$push": {"tags": "new"},
+        "$pull": {"tags": "cold"},
+        "$unset": {"note": ""},
+        "$currentDate": {"updated": True},
+    }
+
+    # query can reference linked documents
+    assert await Product.update_many(
+        F(Product.shop.name) == "Lavka",
+        Mul({F(Product.price): 2}) | AddToSet({F(Product.tags): "sale"}) | Unset(F(Product.note)),
+    ) == 2
+    assert await Product.update_many(F(Product.stock) == 0, Set({F(Product.note): "sold out"})) == 1
+    assert await Product.update_many({}, Min({F(Product.price): 35}) | Max({F(Product.stock): 1})) == 3
+    assert await Product.update_many(F(Product.name) == "Ball", Inc({F(Product.stock): 1})) == 1
+
+    bread, milk, ball = await Product.find(sort={F(Product.id): 1})
+    assert (bread.price, bread.stock, bread.tags, bread.note) == (20, 5, ["food", "sale"], None)
+    assert (milk.price, milk.stock, milk.tags, milk.note) == (35, 1, ["food", "cold", "sale"], "sold out")
+    assert (ball.price, ball.stock, ball.tags, ball.note) == (30, 4, ["toy"], None)
+
+
+async def test_delete_many(engine: Engine):
+    await engine.bind(SerialIDCounter, Shop, Product, Review).init()
+
+    lavka = await Shop(name="Lavka").save()
+    ashan = await Shop(name="Ashan").save()
+    for shop in (lavka, lavka, ashan):
+        product = await Product(shop=shop, name="Bread", price=10, stock=5, tags=[]).save()
+        await Review(product=product, text="Good").save()
+
+    assert await Shop.delete_many(F(Shop.name) == "Lavka") == 1
+    assert [p.shop.name for p in await Product.find()] == ["Ashan"]
+    assert await Review.count_documents() == 1
+
+    assert await Product.delete_many(F(Product.shop.name) == "Ashan") == 1
+    assert await Review.count_documents() == 0
+    assert await Shop.delete_many(F(Shop.name) == "Lavka") == 0
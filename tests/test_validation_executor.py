@@ -0,0 +1,44 @@
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from butty import Engine, F
+from butty.compat import TypeAdapterCompat
+from butty.utility.serialid_document import SerialIDCounter, SerialIDDocument
+
+
+class Item(SerialIDDocument):
+    name: str
+
+
+@pytest.fixture
+def engine_options():
+    with ThreadPoolExecutor(2) as executor:
+        yield {
+            "validation_executor": executor,
+            "validation_chunk_size": 3,
+        }
+
+
+async def test_validation_executor(engine: Engine):
+    await engine.bind(SerialIDCounter, Item).init()
+
+    for i in range(10):
+        await Item(name=f"Item{i}").save()
+
+    names = [f"Item{i}" for i in range(10)]
+    assert [item.name for item in await Item.find(sort={F(Item.id): 1})] == names
+    assert [item.name async for item in Item.find_iter(sort={F(Item.id): 1}, batch_size=7)] == names
+
+    items, count = await Item.find_and_count(sort={F(Item.id): -1}, limit=8)
+    assert [item.name for item in items] == names[:1:-1]
+    assert count == 10
+
+
+def test_adapter_pickling():
+    # adapter is built once per type when tasks are unpickled in worker process
+    validate = TypeAdapterCompat(list[Item]).validate
+    adapters = [pickle.loads(pickle.dumps(validate)).__self__ for _ in range(2)]
+    assert adapters[0] is adapters[1]
+    assert adapters[0].validate([{"id": 1, "name": "Item"}]) == [Item(id=1, name="Item")]